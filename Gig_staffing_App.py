@@ -1,89 +1,147 @@
+import datetime
+
 import streamlit as st
-import sqlite3
 import pandas as pd
-from streamlit_sortables import sort_items
-
-# DB setup
-conn = sqlite3.connect("gig_staffing.db", check_same_thread=False)
-c = conn.cursor()
-
-# Create tables
-c.execute('''CREATE TABLE IF NOT EXISTS gigs (
-    id INTEGER PRIMARY KEY AUTOINCREMENT,
-    client_name TEXT,
-    gig_name TEXT,
-    date TEXT,
-    venue TEXT
-)''')
-
-c.execute('''CREATE TABLE IF NOT EXISTS singers (
-    id INTEGER PRIMARY KEY AUTOINCREMENT,
-    first_name TEXT,
-    last_name TEXT,
-    email TEXT
-)''')
-
-c.execute('''CREATE TABLE IF NOT EXISTS gig_singer_status (
-    id INTEGER PRIMARY KEY AUTOINCREMENT,
-    gig_id INTEGER,
-    singer_id INTEGER,
-    status TEXT,
-    UNIQUE(gig_id, singer_id)
-)''')
-
-conn.commit()
+import gig_db
+import gig_import
+import gig_schedule
+from sales_suite.ui import metrics_view
+
+
+# DB setup: one pool per server process, reused across reruns and sessions; migrations run on first connect
+@st.cache_resource
+def connection_pool():
+    return gig_db.ConnectionPool()
+
 
 # Constants
 STATUSES = ["Inquired", "Available", "Not Available", "Booked", "Possible"]
 
+
+def short_search_note(text):
+    if gig_db.short_query(text):
+        st.caption(f"Searches of one or two letters only rank the first {gig_db.SHORT_QUERY_CANDIDATES} matches; type more for the best matches.")
+
+
+def gig_picker(label, key):
+    # Gig ids, not names, identify the selection, so duplicate names stay distinct.
+    # With search text the options come from the full-text index, best match first.
+    text = st.text_input("Search gigs", key=f"{key}-search", placeholder="Gig name, client or venue")
+    if text:
+        options = {gid: f"{name} · {date} · {client}" for gid, name, client, date, _ in gig_db.search_gigs(conn, text)}
+        short_search_note(text)
+    else:
+        options = {gid: f"{name} · {date}" for gid, name, date in gig_db.list_gigs(conn)}
+    if not options:
+        st.info("No gigs match your search." if text else "No gigs created yet.")
+        return None
+    return st.selectbox(label, list(options), format_func=options.get, key=key)
+
+
+def bulk_import(kind, importer, columns):
+    st.subheader("Bulk Import")
+    uploaded_file = st.file_uploader(f"CSV or XLSX with a header row: {columns}", type=["csv", "xlsx"], key=f"import-{kind}")
+    if not (uploaded_file and st.button(f"Import {kind}")):
+        return
+    status = st.empty()
+    result = importer(conn, uploaded_file, progress=lambda rows: status.caption(f"{rows:,} rows read..."))
+    status.empty()
+    rate = result.rows / result.seconds if result.seconds else 0
+    if result.error:
+        st.error(f"Could not read the rest of the file ({result.error}). {result.inserted:,} {kind} from the "
+                 f"{result.rows:,} rows before it were imported; fix the file and import it again to add the rest "
+                 f"(rows already imported are skipped as duplicates).")
+    else:
+        st.success(f"Imported {result.inserted:,} {kind} from {result.rows:,} rows in {result.seconds:.1f}s ({rate:,.0f} rows/s). "
+                   f"Skipped {result.duplicates:,} duplicates and rejected {len(result.rejects):,} rows.")
+    if result.rejects:
+        st.dataframe(pd.DataFrame(result.rejects, columns=["Row", "Reason"]), hide_index=True)
+
+
 # Pages
+def upcoming_overview():
+    # Per-status counts for every upcoming gig, read from the trigger-maintained rollup table
+    rows = gig_db.load_rollup(conn, datetime.date.today().isoformat())
+    if not rows:
+        return
+    rollup = pd.DataFrame(rows, columns=["id", "Gig", "Date", "Venue", "Needed", "status", "count"])
+    counts = rollup.pivot_table(index="id", columns="status", values="count", aggfunc="sum").reindex(columns=STATUSES)
+    overview = rollup.drop_duplicates("id").set_index("id")[["Gig", "Date", "Venue", "Needed"]].join(counts)
+    overview[STATUSES] = overview[STATUSES].fillna(0).astype(int)
+    # A gig is unfilled until as many singers as it needs are Booked
+    unfilled = overview["Booked"] < overview["Needed"]
+
+    st.subheader("Upcoming Gigs")
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Upcoming gigs", len(overview))
+    col2.metric("Unfilled gigs", int(unfilled.sum()))
+    col3.metric("Singers booked", int(overview["Booked"].sum()))
+    if st.checkbox("Only unfilled gigs"):
+        overview = overview[unfilled]
+    st.dataframe(overview, hide_index=True)
+
+
 def home():
+    from streamlit_sortables import sort_items  # only the board needs the drag-and-drop component
+
     st.title("Gig Staffing Dashboard")
 
-    gigs = pd.read_sql_query("SELECT * FROM gigs", conn)
-    if gigs.empty:
-        st.info("No gigs created yet.")
-        return
+    upcoming_overview()
 
-    selected_gig = st.selectbox("Select a gig", gigs["gig_name"])
-    gig_id = gigs[gigs["gig_name"] == selected_gig]["id"].values[0]
+    gig_id = gig_picker("Select a gig", "home-gig")
+    if gig_id is None:
+        return
 
-    status_df = pd.read_sql_query(f"""
-        SELECT s.id, s.first_name || ' ' || s.last_name as name, g.status
-        FROM gig_singer_status g
-        JOIN singers s ON g.singer_id = s.id
-        WHERE g.gig_id = ?
-    """, conn, params=(gig_id,))
+    board_key = f"board-{gig_id}"
+    board = st.session_state.setdefault(board_key, {"generation": 0, "seen": gig_db.load_board(conn, gig_id)})
+    if board.pop("notice", None):
+        st.warning("Another booker changed this gig while you were editing, so the board was reloaded. Please redo your move.")
+    # Set before the remount below, so the message survives the rerun
+    if conflict := board.pop("double_booked", None):
+        st.error(conflict)
 
-    if status_df.empty:
+    # The board shows what this booker last saw; moves are diffed against that, not against the live table
+    if not board["seen"]:
+        board["seen"] = gig_db.load_board(conn, gig_id)
+    seen = {sid: row for sid, row in board["seen"].items() if row[1] in STATUSES}
+    if not seen:
         st.info("No singers assigned to this gig yet.")
         return
 
-    name_to_id = dict(zip(status_df["name"], status_df["id"]))
+    # Board items are plain strings, so repeated names get the singer id appended to stay distinct
+    names = [name for name, _, _ in seen.values()]
+    labels = {sid: name if names.count(name) == 1 else f"{name} (#{sid})" for sid, (name, _, _) in seen.items()}
+    label_to_id = {label: sid for sid, label in labels.items()}
 
     st.subheader("Reassign Singers by Dragging Between Columns")
 
     # Convert to a list of dicts format required by sort_items
     initial = [
-        {"title": status, "items": status_df[status_df["status"] == status]["name"].tolist()}
+        {"header": status, "items": [labels[sid] for sid, (_, status_, _) in seen.items() if status_ == status]}
         for status in STATUSES
     ]
 
-    new_lists = sort_items(initial, direction="horizontal")
+    new_lists = sort_items(initial, multi_containers=True, direction="horizontal", key=f"{board_key}-{board['generation']}")
+
+    # Flatten the result and keep only singers that changed column
+    shown = {label_to_id[label]: col["header"] for col in new_lists for label in col["items"]}
+    moves = {sid: status for sid, status in shown.items() if seen[sid][1] != status}
 
-    # Flatten the result and rebuild the status assignment
-    new_status_map = {}
-    for col in new_lists:
-        for name in col["items"]:
-            new_status_map[name] = col["title"]
+    double = gig_db.booked_elsewhere(conn, gig_id, [sid for sid, status in moves.items() if status == "Booked"])
+    if double:
+        board["double_booked"] = "Already booked that day, so not moved: " + "; ".join(f"{seen[sid][0]} ({gig})" for sid, gig in double.items())
+        moves = {sid: status for sid, status in moves.items() if sid not in double}
+    if moves:
+        if gig_db.move_singers(conn, gig_id, moves, {sid: seen[sid][2] for sid in moves}):
+            st.success(f"Moved {len(moves)} singer(s).")
+        else:
+            board["notice"] = True
 
-    for name, sid in name_to_id.items():
-        new_status = new_status_map.get(name)
-        if new_status:
-            c.execute("INSERT OR REPLACE INTO gig_singer_status (gig_id, singer_id, status) VALUES (?, ?, ?)",
-                      (gig_id, sid, new_status))
-    conn.commit()
-    st.success("Statuses updated.")
+    # Remount the board from the database if it no longer matches (our conflict or someone else's edit)
+    board["seen"] = gig_db.load_board(conn, gig_id)
+    if {sid: status for sid, (_, status, _) in board["seen"].items() if status in STATUSES} != shown:
+        board["generation"] += 1
+        st.rerun()
 
 
 def manage_gigs():
@@ -93,13 +151,24 @@ def manage_gigs():
         gig_name = st.text_input("Gig Name")
         date = st.date_input("Date")
         venue = st.text_input("Venue")
+        singers_needed = st.number_input("Singers needed", min_value=1, value=1)
         submitted = st.form_submit_button("Create Gig")
         if submitted:
-            c.execute("INSERT INTO gigs (client_name, gig_name, date, venue) VALUES (?, ?, ?, ?)",
-                      (client, gig_name, date.isoformat(), venue))
-            conn.commit()
+            gig_db.add_gig(conn, client, gig_name, date.isoformat(), venue, singers_needed)
             st.success("Gig created.")
 
+    bulk_import("gigs", gig_import.import_gigs, "gig_name, client_name, date (YYYY-MM-DD or MM/DD/YYYY), venue, singers_needed (optional)")
+
+    st.subheader("Attach Documents")
+    gig_id = gig_picker("Gig", "document-gig")
+    uploaded_file = st.file_uploader("Contract, set list or notes (.txt, .pdf, .docx)", type=["txt", "pdf", "docx"])
+    if gig_id is not None and uploaded_file and st.button("Attach"):
+        from sales_suite import extraction
+        with st.spinner("Extracting text..."):
+            text = extraction.cached_extract_text(uploaded_file)
+        gig_db.add_document(conn, gig_id, uploaded_file.name, text, datetime.datetime.now().isoformat(timespec="seconds"))
+        st.success(f"Attached {uploaded_file.name}; its text is now searchable.")
+
 
 def manage_singers():
     st.title("Manage Singers")
@@ -109,45 +178,131 @@ def manage_singers():
         email = st.text_input("Email")
         submitted = st.form_submit_button("Add Singer")
         if submitted:
-            c.execute("INSERT INTO singers (first_name, last_name, email) VALUES (?, ?, ?)",
-                      (fname, lname, email))
-            conn.commit()
+            gig_db.add_singer(conn, fname, lname, email)
             st.success("Singer added.")
 
+    bulk_import("singers", gig_import.import_singers, "first_name, last_name, email")
+
 
 def assign_singers():
     st.title("Assign Singers to Gig")
 
-    gigs = pd.read_sql_query("SELECT * FROM gigs", conn)
-    singers = pd.read_sql_query("SELECT * FROM singers", conn)
+    gig_id = gig_picker("Select Gig", "assign-gig")
+    if gig_id is None:
+        return
+
+    # A search narrows the roster to the best matches instead of listing every singer
+    text = st.text_input("Search singers", placeholder="Name or email")
+    if text:
+        singers = gig_db.search_singers(conn, text)
+        short_search_note(text)
+    else:
+        singers = conn.execute("SELECT id, first_name, last_name, email FROM singers").fetchall()
+    if not singers:
+        st.info("No singers match your search." if text else "Create gigs and singers first.")
+        return
+
+    current = gig_db.load_statuses(conn, gig_id)
+    new_statuses = {}
+    for sid, first_name, last_name, _ in singers:
+        name = first_name + " " + last_name
+        default = current.get(sid, "Inquired")
+        new_statuses[sid] = st.selectbox(f"{name} Status", STATUSES, index=STATUSES.index(default), key=f"{gig_id}-{sid}")
 
-    if gigs.empty or singers.empty:
-        st.info("Create gigs and singers first.")
+    double = gig_db.booked_elsewhere(conn, gig_id, [sid for sid, status in new_statuses.items()
+                                                    if status == "Booked" and current.get(sid) != "Booked"])
+    if double:
+        names = {sid: first_name + " " + last_name for sid, first_name, last_name, _ in singers}
+        st.error("Already booked that day, so not saved: " + "; ".join(f"{names[sid]} ({gig})" for sid, gig in double.items()))
+        new_statuses = {sid: status for sid, status in new_statuses.items() if sid not in double}
+
+    # Singers without a row yet count as changed, so they are recorded as Inquired on first view
+    updated = gig_db.save_statuses(conn, gig_id, new_statuses, current)
+    if updated is None:
+        st.error("Another booker just booked one of these singers elsewhere that day, so nothing was saved. Please review and try again.")
+    elif updated:
+        st.success(f"Statuses updated ({updated} changed).")
+
+
+def auto_staff():
+    st.title("Auto-Staff Upcoming Gigs")
+    today = datetime.date.today().isoformat()
+
+    conflicts = gig_schedule.double_bookings(conn, today)
+    if conflicts:
+        st.subheader("Double Bookings")
+        st.warning(f"{len(conflicts)} singer(s) are Booked on two gigs the same day.")
+        st.dataframe(pd.DataFrame([(name, date, gig, other) for _, name, date, _, gig, _, other in conflicts],
+                                  columns=["Singer", "Date", "Gig", "Also Booked On"]), hide_index=True)
+
+    st.subheader("Proposed Bookings")
+    st.caption("Books Available singers first, then Possible ones, up to each gig's singers needed; "
+               "nobody is booked twice on one date.")
+    if st.button("Propose bookings"):
+        st.session_state.staffing_plan = gig_schedule.propose(conn, today)
+    plan = st.session_state.get("staffing_plan")
+    if plan is None:
         return
+    if not plan.bookings:
+        st.info("No open seats can be filled from Available or Possible singers.")
+    else:
+        gigs = dict(conn.execute("SELECT id, gig_name || ' · ' || date FROM gigs WHERE date >= ?", (today,)))
+        singers = dict(conn.execute("SELECT id, first_name || ' ' || last_name FROM singers"))
+        st.dataframe(pd.DataFrame([(gigs[b.gig_id], singers.get(b.singer_id), b.from_status) for b in plan.bookings],
+                                  columns=["Gig", "Singer", "Currently"]), hide_index=True)
+    if plan.open_slots:
+        st.warning(f"{sum(plan.open_slots.values())} seat(s) on {len(plan.open_slots)} gig(s) stay open: not enough Available or Possible singers.")
+    if plan.bookings and st.button(f"Book {len(plan.bookings)} singer(s)"):
+        del st.session_state.staffing_plan
+        if gig_schedule.apply_plan(conn, plan):
+            st.success(f"Booked {len(plan.bookings)} singer(s).")
+        else:
+            st.warning("Statuses changed since this plan was made, so nothing was booked. Please propose again.")
 
-    selected_gig = st.selectbox("Select Gig", gigs["gig_name"])
-    gig_id = gigs[gigs["gig_name"] == selected_gig]["id"].values[0]
 
-    for _, row in singers.iterrows():
-        sid = row["id"]
-        name = row["first_name"] + " " + row["last_name"]
-        current = c.execute("SELECT status FROM gig_singer_status WHERE gig_id = ? AND singer_id = ?", (gig_id, sid)).fetchone()
-        default = current[0] if current else "Inquired"
-        new_status = st.selectbox(f"{name} Status", STATUSES, index=STATUSES.index(default), key=f"{gig_id}-{sid}")
-        c.execute("INSERT OR REPLACE INTO gig_singer_status (gig_id, singer_id, status) VALUES (?, ?, ?)",
-                  (gig_id, sid, new_status))
-    conn.commit()
-    st.success("Statuses updated.")
+def search():
+    st.title("Search")
+    text = st.text_input("Search singers, gigs and documents", placeholder="Prefixes work: \"jo sm\" finds John Smith")
+    if not text:
+        return
+
+    singers = gig_db.search_singers(conn, text)
+    gigs = gig_db.search_gigs(conn, text)
+    documents = gig_db.search_documents(conn, text)
+    if not (singers or gigs or documents):
+        st.info("Nothing matches your search.")
+        return
+    short_search_note(text)
+    if singers:
+        st.subheader("Singers")
+        st.dataframe(pd.DataFrame(singers, columns=["id", "First Name", "Last Name", "Email"]), hide_index=True)
+    if gigs:
+        st.subheader("Gigs")
+        st.dataframe(pd.DataFrame(gigs, columns=["id", "Gig", "Client", "Date", "Venue"]), hide_index=True)
+    if documents:
+        st.subheader("Documents")
+        gig_names = dict(conn.execute(f"SELECT id, gig_name FROM gigs WHERE id IN ({','.join('?' * len(documents))})",
+                                      [gig_id for _, gig_id, _, _ in documents]).fetchall())
+        for _, gig_id, name, snippet in documents:
+            st.markdown(f"**{name}** · {gig_names.get(gig_id, 'no gig')}")
+            st.caption(snippet)
 
 
 # Navigation
-page = st.sidebar.selectbox("Page", ["Home", "Manage Gigs", "Manage Singers", "Assign Singers"])
-
-if page == "Home":
-    home()
-elif page == "Manage Gigs":
-    manage_gigs()
-elif page == "Manage Singers":
-    manage_singers()
-elif page == "Assign Singers":
-    assign_singers()
+page = st.sidebar.selectbox("Page", ["Home", "Search", "Manage Gigs", "Manage Singers", "Assign Singers", "Auto-Staff", "Metrics"])
+
+with connection_pool().connection() as conn:
+    if page == "Home":
+        home()
+    elif page == "Search":
+        search()
+    elif page == "Manage Gigs":
+        manage_gigs()
+    elif page == "Manage Singers":
+        manage_singers()
+    elif page == "Assign Singers":
+        assign_singers()
+    elif page == "Auto-Staff":
+        auto_staff()
+    elif page == "Metrics":
+        metrics_view.render_metrics()
@@ -0,0 +1,117 @@
+import io
+import random
+import zipfile
+from xml.sax.saxutils import escape
+
+import gig_db
+
+WORDS = ("account plan revenue pipeline quarter territory renewal forecast customer stakeholder "
+         "expansion pricing contract onboarding integration security platform analytics roadmap").split()
+
+STATUSES = ["Inquired", "Available", "Not Available", "Booked", "Possible"]
+
+
+def sentences(count, seed=0):
+    rng = random.Random(seed)
+    return [" ".join(rng.choice(WORDS) for _ in range(12)).capitalize() + "." for _ in range(count)]
+
+
+def pdf_bytes(pages, lines_per_page=40):
+    # A plain PDF with one Helvetica text stream per page, written by hand so no PDF library is needed
+    text = sentences(pages * lines_per_page)
+    objects = ["<< /Type /Catalog /Pages 2 0 R >>", None, "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for page in range(pages):
+        lines = text[page * lines_per_page:(page + 1) * lines_per_page]
+        ops = ["BT /F1 9 Tf 40 800 Td 11 TL"] + [f"({line}) '" for line in lines] + ["ET"]
+        stream = "\n".join(ops)
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+        objects.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 842] "
+                       f"/Resources << /Font << /F1 3 0 R >> >> /Contents {len(objects)} 0 R >>")
+        kids.append(f"{len(objects)} 0 R")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {pages} >>"
+
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(out.tell())
+        out.write(f"{number} 0 obj\n{body}\nendobj\n".encode("latin-1"))
+    xref = out.tell()
+    out.write(f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode())
+    for offset in offsets:
+        out.write(f"{offset:010d} 00000 n \n".encode())
+    out.write(f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode())
+    return out.getvalue()
+
+
+def docx_bytes(paragraphs):
+    # The minimum docx2txt needs: content types, the package relationship and word/document.xml
+    body = "".join(f"<w:p><w:r><w:t>{escape(line)}</w:t></w:r></w:p>" for line in sentences(paragraphs, seed=1))
+    out = io.BytesIO()
+    with zipfile.ZipFile(out, "w", zipfile.ZIP_DEFLATED) as z:
+        z.writestr("[Content_Types].xml",
+                   '<?xml version="1.0" encoding="UTF-8"?>'
+                   '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+                   '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+                   '<Default Extension="xml" ContentType="application/xml"/>'
+                   '<Override PartName="/word/document.xml" '
+                   'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+                   '</Types>')
+        z.writestr("_rels/.rels",
+                   '<?xml version="1.0" encoding="UTF-8"?>'
+                   '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+                   '<Relationship Id="rId1" Target="word/document.xml" '
+                   'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument"/>'
+                   '</Relationships>')
+        z.writestr("word/document.xml",
+                   '<?xml version="1.0" encoding="UTF-8"?>'
+                   '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+                   f"<w:body>{body}</w:body></w:document>")
+    return out.getvalue()
+
+
+def text_bytes(size):
+    line = " ".join(WORDS) + "\n"
+    return (line * (size // len(line) + 1)).encode()[:size]
+
+
+def singers_csv(count, seed=0):
+    # A roster export like a booker would upload: every 50th row repeats an earlier email in other
+    # case and every 200th (offset by 100) has no email, so dedupe and rejects are exercised too
+    rng = random.Random(seed)
+    lines = ["First Name,Last Name,Email"]
+    for i in range(count):
+        email = f"singer{i}@example.com"
+        if i % 50 == 49:
+            email = f"SINGER{rng.randrange(i)}@example.com"
+        elif i % 200 == 100:
+            email = ""
+        lines.append(f"Singer{i},Surname{i % 997},{email}")
+    return ("\n".join(lines) + "\n").encode()
+
+
+def gig_database(path, singers=10000, gigs=1000, statuses_per_gig=100, singers_needed=40, seed=0):
+    # Populates a gig_db schema at `path`; every gig gets `statuses_per_gig` distinct singers
+    rng = random.Random(seed)
+    conn = gig_db.connection(path)
+    with conn:
+        conn.executemany("INSERT INTO singers (first_name, last_name, email) VALUES (?, ?, ?)",
+                         [(f"Singer{i}", f"Surname{i % 997}", f"singer{i}@example.com") for i in range(singers)])
+        conn.executemany("INSERT INTO gigs (client_name, gig_name, date, venue, singers_needed) VALUES (?, ?, ?, ?, ?)",
+                         [(f"Client {i % 50}", f"Gig {i}", f"2025-{i % 12 + 1:02d}-{i % 28 + 1:02d}", f"Venue {i % 200}", singers_needed)
+                          for i in range(gigs)])
+        # A singer is Booked at most once per date (gig_db enforces it); a second draw becomes Available
+        dates = dict(conn.execute("SELECT id, date FROM gigs"))
+        booked = set()
+        rows = []
+        for gig in range(1, gigs + 1):
+            for singer in rng.sample(range(1, singers + 1), statuses_per_gig):
+                status = rng.choice(STATUSES)
+                if status == "Booked":
+                    if (singer, dates[gig]) in booked:
+                        status = "Available"
+                    booked.add((singer, dates[gig]))
+                rows.append((gig, singer, status))
+        conn.executemany("INSERT INTO gig_singer_status (gig_id, singer_id, status) VALUES (?, ?, ?)", rows)
+    return conn
@@ -0,0 +1,399 @@
+import argparse
+import datetime
+import json
+import os
+import platform
+import random
+import shutil
+import sys
+import tempfile
+import time
+from collections import namedtuple
+from functools import cached_property
+
+import numpy as np
+import pandas as pd
+
+import gig_db
+import gig_import
+import gig_schedule
+from benchmarks import generate, stubs
+from sales_suite import completion, extraction, http_client, news, results_store, search, summarizer
+from sales_suite.response_cache import ResponseCache
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+# A case whose p50 is more than this much slower than its baseline counts as a regression
+TOLERANCE = 0.25
+
+COMPANIES = ["Acme", "Globex", "Initech", "Umbrella"]
+TITLES = ["Sales Engineer", "Account Executive"]
+
+# Random status writes avoid Booked: it could double-book a singer, which gig_db rejects
+WRITE_STATUSES = [status for status in generate.STATUSES if status != "Booked"]
+
+Case = namedtuple("Case", ["name", "run", "iterations", "unit", "setup", "expect"])
+CASES = []
+
+
+def case(name, iterations, unit, setup=None, expect=None):
+    # run(ctx) performs one timed iteration and returns how many `unit`s it processed;
+    # setup(ctx), if given, runs untimed before every iteration (e.g. to empty the caches).
+    # expect, if given, is the count every iteration must return, so a case that stops doing
+    # its work fails instead of looking faster.
+    def register(run):
+        CASES.append(Case(name, run, iterations, unit, setup, expect))
+        return run
+    return register
+
+
+def check(name, actual, expected):
+    if actual != expected:
+        raise AssertionError(f"{name}: got {actual!r}, expected {expected!r}")
+
+
+class Context:
+    # Fixtures are built on first use, so --only search never generates the gig database
+    def __init__(self, tmp):
+        self.tmp = tmp
+        self.rng = random.Random(0)
+        self.generation = 0
+        self.ranked_store = None
+        self.plan_size = None
+
+    @cached_property
+    def jsearch_url(self):
+        return stubs.serve(stubs.JSearchHandler)[0] + "/search"
+
+    @cached_property
+    def rss_url(self):
+        return stubs.serve(stubs.RSSHandler)[0] + "/rss"
+
+    @cached_property
+    def completion_url(self):
+        return stubs.serve(stubs.CompletionHandler)[0] + "/v1/chat/completions"
+
+    @cached_property
+    def pdf(self):
+        return generate.pdf_bytes(200)
+
+    @cached_property
+    def docx(self):
+        return generate.docx_bytes(20000)
+
+    @cached_property
+    def text(self):
+        return generate.text_bytes(5 * 1024 * 1024)
+
+    @cached_property
+    def document(self):
+        return "\n".join(generate.sentences(3000, seed=2))
+
+    @cached_property
+    def gig_conn(self):
+        return generate.gig_database(os.path.join(self.tmp, "gigs.db"))
+
+    @cached_property
+    def roster(self):
+        return generate.singers_csv(20000)
+
+    @cached_property
+    def gig_ids(self):
+        return [gig_id for gig_id, in self.gig_conn.execute("SELECT id FROM gigs")]
+
+    @cached_property
+    def rows(self):
+        page = stubs.JSearchHandler.page["data"]
+        return [dict(search.job_row(job), Company=f"Company {i % 300}", Location=f"City {i % 120}")
+                for i, job in enumerate(page[i % len(page)] for i in range(10000))]
+
+
+def fresh_caches(ctx):
+    # Every module cache moves to a new, empty database file
+    ctx.generation += 1
+    for module in (search, news, extraction, completion):
+        module.cache = ResponseCache(module.cache.name, path=os.path.join(ctx.tmp, f"cache-{ctx.generation}.db"))
+
+
+def _search(ctx):
+    queries = search.build_queries(COMPANIES, TITLES)
+    store = results_store.ResultsStore()
+    for result, new_jobs in search.fetch_unique(queries, [], "", {}, 200, url=ctx.jsearch_url):
+        store.extend([search.job_row(job) for job in new_jobs])
+    return len(store)
+
+
+@case("search.fetch_cold", 5, "postings", setup=fresh_caches, expect=200)
+def search_cold(ctx):
+    return _search(ctx)
+
+
+@case("search.fetch_warm", 10, "postings", expect=200)
+def search_warm(ctx):
+    return _search(ctx)
+
+
+@case("search.results_store", 20, "rows", expect=10000)
+def search_store(ctx):
+    store = results_store.ResultsStore()
+    store.extend(ctx.rows)
+    companies = store.values("Company")[::2]
+    order = store.order({"Company": companies, "Location": store.values("Location")}, "Job Title")
+    store.window(order, 0, 50)
+    return len(store)
+
+
+@case("search.rank_index", 5, "rows", expect=10000)
+def search_rank_index(ctx):
+    # Index 10k postings from scratch and score them against a profile
+    store = results_store.ResultsStore()
+    store.extend(ctx.rows)
+    store.rank({}, ctx.document[:5000])
+    return len(store)
+
+
+@case("search.rank_score", 20, "rows", expect=10000)
+def search_rank_score(ctx):
+    # A new profile against postings that are already indexed
+    if ctx.ranked_store is None:
+        ctx.ranked_store = results_store.ResultsStore()
+        ctx.ranked_store.extend(ctx.rows)
+        ctx.ranked_store.rank({}, "")
+    start = ctx.rng.randrange(len(ctx.document) - 5000)
+    ctx.ranked_store.rank({}, ctx.document[start:start + 5000])
+    return len(ctx.ranked_store)
+
+
+@case("news.fetch_cold", 5, "feeds", setup=fresh_caches, expect=4)
+def news_cold(ctx):
+    return len(news.fetch_news(COMPANIES * 2))
+
+
+@case("news.parse_top", 50, "items", expect=100)
+def news_parse(ctx):
+    return len(news.parse_top(stubs.RSSHandler.feed, 100))
+
+
+@case("extract.pdf_200_pages", 3, "pages")
+def extract_pdf(ctx):
+    text = extraction.extract_text(extraction.NamedBytes(ctx.pdf, "bench.pdf"))
+    check("pdf lines", len(text.splitlines()), 200 * 40)
+    return 200
+
+
+@case("extract.docx_20k_paragraphs", 3, "paragraphs")
+def extract_docx(ctx):
+    text = extraction.extract_text(extraction.NamedBytes(ctx.docx, "bench.docx"))
+    check("docx sentences", text.count("."), 20000)
+    return 20000
+
+
+@case("extract.txt_5mb", 5, "MB")
+def extract_txt(ctx):
+    check("txt length", len(extraction.extract_text(extraction.NamedBytes(ctx.text, "bench.txt"))), len(ctx.text))
+    return 5
+
+
+def _complete(ctx, prompt):
+    response = http_client.post(ctx.completion_url, json={"model": "mock", "messages": [{"role": "user", "content": prompt}]})
+    response.raise_for_status()
+    return response.json()["choices"][0]["message"]["content"]
+
+
+@case("summarize.condense", 3, "chunks", setup=fresh_caches, expect=33)
+def summarize_condense(ctx):
+    _, stats = summarizer.condense(ctx.document, lambda prompt: completion.cached_completion("mock", prompt, 0.3, lambda: _complete(ctx, prompt)))
+    return len(stats)
+
+
+@case("summarize.stream", 5, "tokens", setup=fresh_caches, expect=120)
+def summarize_stream(ctx):
+    stats = {}
+    for _ in completion.stream_completion(ctx.completion_url, {}, "mock", ctx.document[:4000], stats=stats):
+        pass
+    return stats["tokens"]
+
+
+@case("gig.gig_list", 50, "gigs", expect=1000)
+def gig_list(ctx):
+    return len(ctx.gig_conn.execute("SELECT id, gig_name FROM gigs ORDER BY date").fetchall())
+
+
+@case("gig.singer_roster", 20, "singers", expect=10000)
+def gig_roster(ctx):
+    return len(pd.read_sql_query("SELECT id, first_name, last_name FROM singers", ctx.gig_conn))
+
+
+@case("gig.load_board", 200, "boards")
+def gig_board(ctx):
+    # Every generated gig has a status for 100 singers
+    check("board size", len(gig_db.load_board(ctx.gig_conn, ctx.rng.choice(ctx.gig_ids))), 100)
+    return 1
+
+
+@case("gig.load_rollup", 50, "gigs", expect=1000)
+def gig_rollup(ctx):
+    # Every generated gig falls in 2025, so this is the dashboard across all of them
+    return len({row[0] for row in gig_db.load_rollup(ctx.gig_conn, "2025-01-01")})
+
+
+@case("gig.search", 200, "queries")
+def gig_search(ctx):
+    # A prefix lookup like a booker typing into the search box, e.g. "singer12 sur"
+    n = ctx.rng.randrange(10000)
+    check("singer found", f"Singer{n // 10}" in {first for _, first, _, _ in gig_db.search_singers(ctx.gig_conn, f"singer{n // 10} sur")}, True)
+    check("gig matches", len(gig_db.search_gigs(ctx.gig_conn, f"client {n % 50}")), gig_db.SEARCH_LIMIT)
+    return 1
+
+
+@case("gig.load_statuses", 200, "rosters")
+def gig_statuses(ctx):
+    check("roster size", len(gig_db.load_statuses(ctx.gig_conn, ctx.rng.choice(ctx.gig_ids))), 100)
+    return 1
+
+
+@case("gig.save_statuses", 50, "rows")
+def gig_save(ctx):
+    gig_id = ctx.rng.choice(ctx.gig_ids)
+    current = gig_db.load_statuses(ctx.gig_conn, gig_id)
+    changed = {sid: ctx.rng.choice(WRITE_STATUSES) for sid in ctx.rng.sample(sorted(current), 10)}
+    updated = gig_db.save_statuses(ctx.gig_conn, gig_id, {**current, **changed}, current)
+    check("changed rows", updated, sum(current[sid] != status for sid, status in changed.items()))
+    return updated
+
+
+@case("gig.move_singers", 100, "moves", expect=5)
+def gig_move(ctx):
+    gig_id = ctx.rng.choice(ctx.gig_ids)
+    board = gig_db.load_board(ctx.gig_conn, gig_id)
+    moves = {sid: ctx.rng.choice(WRITE_STATUSES) for sid in ctx.rng.sample(sorted(board), 5)}
+    check("moved", gig_db.move_singers(ctx.gig_conn, gig_id, moves, {sid: board[sid][2] for sid in moves}), True)
+    return len(moves)
+
+
+@case("gig.double_bookings", 20, "checks")
+def gig_double_bookings(ctx):
+    # The generated database never double-books, so the whole check comes back empty
+    check("double bookings", gig_schedule.double_bookings(ctx.gig_conn), [])
+    return 1
+
+
+@case("gig.auto_staff_propose", 5, "gigs", expect=1000)
+def gig_auto_staff(ctx):
+    # Plans the whole season (1k gigs x 10k singers); the plan is not written, so every run solves the same problem
+    # Other gig.* cases rewrite statuses, so the plan size is only pinned within this case's runs
+    bookings = len(gig_schedule.propose(ctx.gig_conn, "").bookings)
+    if ctx.plan_size is None:
+        check("plan found bookings", bookings > 0, True)
+        ctx.plan_size = bookings
+    check("bookings", bookings, ctx.plan_size)
+    return len(ctx.gig_ids)
+
+
+def empty_gig_database(ctx):
+    ctx.generation += 1
+    ctx.import_conn = gig_db.connection(os.path.join(ctx.tmp, f"import-{ctx.generation}.db"))
+
+
+@case("gig.import_singers_20k", 3, "rows", setup=empty_gig_database, expect=20000)
+def gig_import_singers(ctx):
+    result = gig_import.import_singers(ctx.import_conn, extraction.NamedBytes(ctx.roster, "roster.csv"))
+    check("import", (result.inserted, result.duplicates, len(result.rejects), result.error), (19505, 395, 100, None))
+    return result.rows
+
+
+def measure(ctx, bench):
+    if bench.setup is None:
+        bench.run(ctx)  # warm-up, untimed
+    latencies = []
+    items = 0
+    for _ in range(bench.iterations):
+        if bench.setup is not None:
+            bench.setup(ctx)
+        start = time.perf_counter()
+        count = bench.run(ctx)
+        latencies.append(time.perf_counter() - start)
+        if bench.expect is not None:
+            check(bench.name, count, bench.expect)
+        items += count
+    latencies = np.array(latencies)
+    return {
+        "iterations": bench.iterations,
+        "unit": bench.unit,
+        "throughput": items / latencies.sum() if latencies.sum() else 0.0,
+        "mean_ms": 1000 * latencies.mean(),
+        "p50_ms": 1000 * np.percentile(latencies, 50),
+        "p95_ms": 1000 * np.percentile(latencies, 95),
+        "p99_ms": 1000 * np.percentile(latencies, 99),
+        "max_ms": 1000 * latencies.max()
+    }
+
+
+def compare(result, baseline):
+    # Relative p50 change against the baseline, or None when there is nothing to compare to
+    if not baseline or not baseline.get("p50_ms"):
+        return None
+    return result["p50_ms"] / baseline["p50_ms"] - 1
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the job search, extraction, summarization and gig staffing hot paths offline.")
+    parser.add_argument("--only", help="comma-separated case name prefixes, e.g. search,gig.load_board")
+    parser.add_argument("--baseline", default=BASELINE, help="baseline file to compare against / write")
+    parser.add_argument("--save-baseline", action="store_true", help="write this run as the new baseline")
+    parser.add_argument("--check", action="store_true", help="exit non-zero if any case regressed past the tolerance")
+    parser.add_argument("--json", help="also write this run's results to a file")
+    args = parser.parse_args(argv)
+
+    prefixes = args.only.split(",") if args.only else None
+    selected = [bench for bench in CASES if prefixes is None or any(bench.name.startswith(p) for p in prefixes)]
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f).get("cases", {})
+
+    # The stubs are local, so the per-host request spacing meant for RapidAPI is switched off
+    search.limiter = search.RateLimiter(0)
+    tmp = tempfile.mkdtemp(prefix="suite-bench-")
+    ctx = Context(tmp)
+    fresh_caches(ctx)
+    news.feed_url = lambda company: f"{ctx.rss_url}?q={company}"
+    results = {}
+    regressions = []
+    try:
+        print(f"{'case':32} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'throughput':>20} {'vs baseline':>12}")
+        for bench in selected:
+            result = results[bench.name] = measure(ctx, bench)
+            change = compare(result, baseline.get(bench.name))
+            flag = ""
+            if change is not None:
+                flag = f"{change:+.0%}"
+                if change > TOLERANCE:
+                    flag += " !"
+                    regressions.append(bench.name)
+            rate = f"{result['throughput']:.1f} {bench.unit}/s"
+            print(f"{bench.name:32} {result['p50_ms']:9.2f} {result['p95_ms']:9.2f} {result['p99_ms']:9.2f} {rate:>20} {flag:>12}")
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+    run = {
+        "created": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "machine": f"{platform.system()} {platform.machine()} ({os.cpu_count()} CPUs)",
+        "cases": results
+    }
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(run, f, indent=2)
+    if args.save_baseline:
+        # Cases not run this time keep their previous baseline
+        with open(args.baseline, "w") as f:
+            json.dump(dict(run, cases={**baseline, **results}), f, indent=2)
+        print(f"Baseline written to {args.baseline}")
+    if regressions:
+        print(f"Slower than baseline by more than {TOLERANCE:.0%}: {', '.join(regressions)}")
+        if args.check:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+# Simulated provider latency (s); kept small so runs stay short but connection reuse still shows
+LATENCY = 0.02
+TOKEN_INTERVAL = 0.002
+
+
+def _load(name, mode="r"):
+    with open(os.path.join(FIXTURES, name), mode) as f:
+        return f.read()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def send_body(self, body, content_type, status=200, headers=()):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in headers:
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class JSearchHandler(_Handler):
+    # Replays the recorded page with ids made unique per query and page; pages past `pages` are short
+    page = json.loads(_load("jsearch_page.json"))
+    pages = 3
+
+    def do_GET(self):
+        time.sleep(LATENCY)
+        params = parse_qs(urlparse(self.path).query)
+        query = params.get("query", [""])[0]
+        page = int(params.get("page", ["1"])[0])
+        jobs = self.page["data"] if page <= self.pages else self.page["data"][:3]
+        data = [dict(job, job_id=f"{query}-{page}-{i}", job_apply_link=f"{job['job_apply_link']}?q={query}&p={page}")
+                for i, job in enumerate(jobs)]
+        self.send_body(json.dumps(dict(self.page, data=data)).encode(), "application/json")
+
+
+class RSSHandler(_Handler):
+    feed = _load("news_rss.xml", "rb")
+
+    def do_GET(self):
+        time.sleep(LATENCY)
+        if self.headers.get("If-None-Match") == '"fixture"':
+            self.send_body(b"", "application/rss+xml", 304)
+            return
+        self.send_body(self.feed, "application/rss+xml", headers=[("ETag", '"fixture"')])
+
+
+class CompletionHandler(_Handler):
+    # OpenAI-compatible chat completions: streamed as SSE or returned whole. The "summary"
+    # is the first words of the prompt, so map stages shrink the text the way a model would.
+    reply_words = 120
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        words = body["messages"][0]["content"].split()[:self.reply_words]
+        time.sleep(LATENCY)
+        if not body.get("stream"):
+            reply = {"choices": [{"message": {"role": "assistant", "content": " ".join(words)}}]}
+            self.send_body(json.dumps(reply).encode(), "application/json")
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        for word in words:
+            self._chunk(("data: " + json.dumps({"choices": [{"delta": {"content": word + " "}}]}) + "\n\n").encode())
+            time.sleep(TOKEN_INTERVAL)
+        self._chunk(b"data: [DONE]\n\n")
+        self.wfile.write(b"0\r\n\r\n")
+
+    def _chunk(self, data):
+        self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+        self.wfile.flush()
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # Pooled client connections are dropped without ceremony; that is not a stub failure
+        pass
+
+
+def serve(handler):
+    # Starts a stub on a free local port; returns (base_url, server)
+    server = _Server(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f"http://127.0.0.1:{server.server_port}", server
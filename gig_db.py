@@ -0,0 +1,430 @@
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+from sales_suite import metrics
+
+DB_PATH = "gig_staffing.db"
+
+
+def _repair_blob_ids(conn):
+    # Earlier builds bound numpy int64 ids, which sqlite stored as 8-byte little-endian blobs that
+    # never match an integer id; rows that would duplicate an existing integer row are dropped
+    for column in ("gig_id", "singer_id"):
+        rows = conn.execute(f"SELECT id, {column} FROM gig_singer_status WHERE typeof({column}) = 'blob'").fetchall()
+        conn.executemany(f"UPDATE OR IGNORE gig_singer_status SET {column} = ? WHERE id = ?",
+                         [(int.from_bytes(value, "little"), row_id) for row_id, value in rows])
+        conn.execute(f"DELETE FROM gig_singer_status WHERE typeof({column}) = 'blob'")
+
+
+# Each entry upgrades the schema by one version; PRAGMA user_version records how many have run.
+# Entries are SQL scripts or functions taking the connection. Append new migrations, never edit applied ones.
+MIGRATIONS = [
+    """
+    CREATE TABLE IF NOT EXISTS gigs (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        client_name TEXT,
+        gig_name TEXT,
+        date TEXT,
+        venue TEXT
+    );
+    CREATE TABLE IF NOT EXISTS singers (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        first_name TEXT,
+        last_name TEXT,
+        email TEXT
+    );
+    CREATE TABLE IF NOT EXISTS gig_singer_status (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        gig_id INTEGER,
+        singer_id INTEGER,
+        status TEXT,
+        UNIQUE(gig_id, singer_id)
+    );
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS idx_gig_singer_status_singer ON gig_singer_status(singer_id);
+    CREATE INDEX IF NOT EXISTS idx_gigs_date ON gigs(date);
+    CREATE INDEX IF NOT EXISTS idx_gigs_gig_name ON gigs(gig_name);
+    """,
+    """
+    ALTER TABLE gig_singer_status ADD COLUMN version INTEGER NOT NULL DEFAULT 0;
+    """,
+    _repair_blob_ids,
+    """
+    CREATE TABLE IF NOT EXISTS gig_status_counts (
+        gig_id INTEGER NOT NULL,
+        status TEXT NOT NULL,
+        count INTEGER NOT NULL,
+        PRIMARY KEY (gig_id, status)
+    ) WITHOUT ROWID;
+    DELETE FROM gig_status_counts;
+    INSERT INTO gig_status_counts (gig_id, status, count)
+        SELECT gig_id, status, COUNT(*) FROM gig_singer_status WHERE status IS NOT NULL GROUP BY gig_id, status;
+    CREATE TRIGGER IF NOT EXISTS gig_status_counts_insert AFTER INSERT ON gig_singer_status
+    WHEN new.status IS NOT NULL BEGIN
+        INSERT INTO gig_status_counts (gig_id, status, count) VALUES (new.gig_id, new.status, 1)
+            ON CONFLICT(gig_id, status) DO UPDATE SET count = count + 1;
+    END;
+    CREATE TRIGGER IF NOT EXISTS gig_status_counts_delete AFTER DELETE ON gig_singer_status
+    WHEN old.status IS NOT NULL BEGIN
+        UPDATE gig_status_counts SET count = count - 1 WHERE gig_id = old.gig_id AND status = old.status;
+        DELETE FROM gig_status_counts WHERE gig_id = old.gig_id AND status = old.status AND count = 0;
+    END;
+    CREATE TRIGGER IF NOT EXISTS gig_status_counts_update AFTER UPDATE OF gig_id, status ON gig_singer_status
+    WHEN old.gig_id IS NOT new.gig_id OR old.status IS NOT new.status BEGIN
+        UPDATE gig_status_counts SET count = count - 1 WHERE gig_id = old.gig_id AND status = old.status;
+        DELETE FROM gig_status_counts WHERE gig_id = old.gig_id AND status = old.status AND count = 0;
+        INSERT INTO gig_status_counts (gig_id, status, count) SELECT new.gig_id, new.status, 1 WHERE new.status IS NOT NULL
+            ON CONFLICT(gig_id, status) DO UPDATE SET count = count + 1;
+    END;
+    CREATE TRIGGER IF NOT EXISTS gig_status_counts_gig_delete AFTER DELETE ON gigs BEGIN
+        DELETE FROM gig_status_counts WHERE gig_id = old.id;
+    END;
+    """,
+    # Full-text indexes read their text from the base tables (external content) and are kept in step
+    # by triggers; prefix='2 3' adds prefix indexes so "jo*" style queries don't scan the term list
+    """
+    CREATE TABLE IF NOT EXISTS documents (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        gig_id INTEGER,
+        name TEXT,
+        uploaded TEXT,
+        content TEXT
+    );
+    CREATE INDEX IF NOT EXISTS idx_documents_gig ON documents(gig_id);
+    CREATE VIRTUAL TABLE IF NOT EXISTS singers_fts USING fts5(
+        first_name, last_name, email, content='singers', content_rowid='id', prefix='2 3');
+    CREATE VIRTUAL TABLE IF NOT EXISTS gigs_fts USING fts5(
+        gig_name, client_name, venue, content='gigs', content_rowid='id', prefix='2 3');
+    CREATE VIRTUAL TABLE IF NOT EXISTS documents_fts USING fts5(
+        name, content, content='documents', content_rowid='id', prefix='2 3');
+    INSERT INTO singers_fts(singers_fts) VALUES ('rebuild');
+    INSERT INTO gigs_fts(gigs_fts) VALUES ('rebuild');
+    INSERT INTO documents_fts(documents_fts) VALUES ('rebuild');
+
+    CREATE TRIGGER IF NOT EXISTS singers_fts_insert AFTER INSERT ON singers BEGIN
+        INSERT INTO singers_fts(rowid, first_name, last_name, email) VALUES (new.id, new.first_name, new.last_name, new.email);
+    END;
+    CREATE TRIGGER IF NOT EXISTS singers_fts_delete AFTER DELETE ON singers BEGIN
+        INSERT INTO singers_fts(singers_fts, rowid, first_name, last_name, email)
+            VALUES ('delete', old.id, old.first_name, old.last_name, old.email);
+    END;
+    CREATE TRIGGER IF NOT EXISTS singers_fts_update AFTER UPDATE ON singers BEGIN
+        INSERT INTO singers_fts(singers_fts, rowid, first_name, last_name, email)
+            VALUES ('delete', old.id, old.first_name, old.last_name, old.email);
+        INSERT INTO singers_fts(rowid, first_name, last_name, email) VALUES (new.id, new.first_name, new.last_name, new.email);
+    END;
+
+    CREATE TRIGGER IF NOT EXISTS gigs_fts_insert AFTER INSERT ON gigs BEGIN
+        INSERT INTO gigs_fts(rowid, gig_name, client_name, venue) VALUES (new.id, new.gig_name, new.client_name, new.venue);
+    END;
+    CREATE TRIGGER IF NOT EXISTS gigs_fts_delete AFTER DELETE ON gigs BEGIN
+        INSERT INTO gigs_fts(gigs_fts, rowid, gig_name, client_name, venue)
+            VALUES ('delete', old.id, old.gig_name, old.client_name, old.venue);
+    END;
+    CREATE TRIGGER IF NOT EXISTS gigs_fts_update AFTER UPDATE ON gigs BEGIN
+        INSERT INTO gigs_fts(gigs_fts, rowid, gig_name, client_name, venue)
+            VALUES ('delete', old.id, old.gig_name, old.client_name, old.venue);
+        INSERT INTO gigs_fts(rowid, gig_name, client_name, venue) VALUES (new.id, new.gig_name, new.client_name, new.venue);
+    END;
+
+    CREATE TRIGGER IF NOT EXISTS documents_fts_insert AFTER INSERT ON documents BEGIN
+        INSERT INTO documents_fts(rowid, name, content) VALUES (new.id, new.name, new.content);
+    END;
+    CREATE TRIGGER IF NOT EXISTS documents_fts_delete AFTER DELETE ON documents BEGIN
+        INSERT INTO documents_fts(documents_fts, rowid, name, content) VALUES ('delete', old.id, old.name, old.content);
+    END;
+    CREATE TRIGGER IF NOT EXISTS documents_fts_update AFTER UPDATE ON documents BEGIN
+        INSERT INTO documents_fts(documents_fts, rowid, name, content) VALUES ('delete', old.id, old.name, old.content);
+        INSERT INTO documents_fts(rowid, name, content) VALUES (new.id, new.name, new.content);
+    END;
+    """,
+    # A singer can be Booked on at most one gig per date. The partial index covers Booked rows only,
+    # so the triggers' check (and conflict reports) look at a handful of rows per singer.
+    """
+    ALTER TABLE gigs ADD COLUMN singers_needed INTEGER NOT NULL DEFAULT 1;
+    CREATE INDEX IF NOT EXISTS idx_gig_singer_status_booked ON gig_singer_status(singer_id, gig_id) WHERE status = 'Booked';
+    CREATE TRIGGER IF NOT EXISTS no_double_booking_insert BEFORE INSERT ON gig_singer_status
+    WHEN new.status = 'Booked' AND EXISTS (
+        SELECT 1 FROM gig_singer_status o JOIN gigs g ON g.id = o.gig_id
+        WHERE o.singer_id = new.singer_id AND o.status = 'Booked' AND o.gig_id != new.gig_id
+          AND g.date = (SELECT date FROM gigs WHERE id = new.gig_id))
+    BEGIN
+        SELECT RAISE(ABORT, 'singer is already booked on that date');
+    END;
+    CREATE TRIGGER IF NOT EXISTS no_double_booking_update BEFORE UPDATE OF gig_id, status ON gig_singer_status
+    WHEN new.status = 'Booked' AND EXISTS (
+        SELECT 1 FROM gig_singer_status o JOIN gigs g ON g.id = o.gig_id
+        WHERE o.singer_id = new.singer_id AND o.status = 'Booked' AND o.gig_id != new.gig_id
+          AND g.date = (SELECT date FROM gigs WHERE id = new.gig_id))
+    BEGIN
+        SELECT RAISE(ABORT, 'singer is already booked on that date');
+    END;
+    """,
+]
+
+PRAGMAS = [
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA busy_timeout=5000",
+    "PRAGMA cache_size=-20000",
+    "PRAGMA temp_store=MEMORY",
+    # REPLACE conflict resolution only fires delete triggers with this on; the status rollup needs them
+    "PRAGMA recursive_triggers=ON",
+]
+
+UPSERT_STATUS = """INSERT INTO gig_singer_status (gig_id, singer_id, status) VALUES (?, ?, ?)
+                   ON CONFLICT(gig_id, singer_id) DO UPDATE SET status = excluded.status, version = version + 1"""
+
+# Optimistic check: the row only changes if nobody else has written it since it was read
+MOVE_STATUS = """UPDATE gig_singer_status SET status = ?, version = version + 1
+                 WHERE gig_id = ? AND singer_id = ? AND version = ?"""
+
+
+SEARCH_LIMIT = 20
+# A lone one- or two-letter prefix can match most of the table and bm25 over all of it costs tens of
+# milliseconds, so those searches rank only this many matches (the first by rowid) and the UI says so.
+# Every other search ranks its full match set.
+SHORT_QUERY_CANDIDATES = 200
+
+
+class StaleWrite(Exception):
+    pass
+
+
+_local = threading.local()
+_migrated = set()
+_migrate_lock = threading.Lock()
+
+
+def migrate(conn):
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
+    for number, step in enumerate(MIGRATIONS[version:], version + 1):
+        if callable(step):
+            conn.execute("BEGIN")
+            step(conn)
+            conn.execute(f"PRAGMA user_version = {number}")
+            conn.commit()
+        else:
+            # executescript commits first, so the schema change and version bump share one explicit transaction
+            conn.executescript(f"BEGIN; {step} PRAGMA user_version = {number}; COMMIT;")
+
+
+def _open(path):
+    # check_same_thread is off so pooled connections can move between threads; each is still
+    # only ever used by one thread at a time
+    conn = sqlite3.connect(path, timeout=5, check_same_thread=False)
+    for pragma in PRAGMAS:
+        conn.execute(pragma)
+    with _migrate_lock:
+        if path not in _migrated:
+            migrate(conn)
+            _migrated.add(path)
+    return conn
+
+
+def connection(path=DB_PATH):
+    # One connection per thread, so concurrent bookers never share a cursor; WAL lets their
+    # reads proceed during a write. Scripts run from Streamlit should use a ConnectionPool instead.
+    conns = getattr(_local, "conns", None)
+    if conns is None:
+        conns = _local.conns = {}
+    conn = conns.get(path)
+    if conn is None:
+        conn = conns[path] = _open(path)
+    return conn
+
+
+class ConnectionPool:
+    # Streamlit runs every rerun on a new thread, so thread-local connections would be reopened
+    # (and PRAGMAs re-run) on each interaction; the pool hands out idle connections instead
+    def __init__(self, path=DB_PATH, size=8):
+        self.path = path
+        self.size = size
+        self.idle = queue.LifoQueue()
+
+    @contextmanager
+    def connection(self):
+        try:
+            conn = self.idle.get_nowait()
+        except queue.Empty:
+            conn = _open(self.path)
+        try:
+            yield conn
+        finally:
+            if conn.in_transaction:
+                conn.rollback()
+            if self.idle.qsize() < self.size:
+                self.idle.put(conn)
+            else:
+                conn.close()
+
+
+@metrics.timed("sql_seconds", query="load_statuses")
+def load_statuses(conn, gig_id):
+    # One query for the whole roster instead of one per singer
+    return dict(conn.execute("SELECT singer_id, status FROM gig_singer_status WHERE gig_id = ?", (gig_id,)).fetchall())
+
+
+@metrics.timed("sql_seconds", query="save_statuses")
+def save_statuses(conn, gig_id, new_statuses, current):
+    # Upsert only singers whose status differs from what was loaded, in a single transaction. Returns
+    # the number changed, or None if a double booking committed meanwhile made the triggers reject it
+    # (nothing is written then)
+    changed = [(gig_id, sid, status) for sid, status in new_statuses.items() if current.get(sid) != status]
+    if changed:
+        try:
+            with conn:
+                conn.executemany(UPSERT_STATUS, changed)
+        except sqlite3.IntegrityError:
+            return None
+    return len(changed)
+
+
+@metrics.timed("sql_seconds", query="load_board")
+def load_board(conn, gig_id):
+    # {singer_id: (name, status, version)} for every singer with a status on this gig
+    rows = conn.execute("""
+        SELECT s.id, s.first_name || ' ' || s.last_name, g.status, g.version
+        FROM gig_singer_status g
+        JOIN singers s ON g.singer_id = s.id
+        WHERE g.gig_id = ?
+    """, (gig_id,)).fetchall()
+    return {sid: (name, status, version) for sid, name, status, version in rows}
+
+
+@metrics.timed("sql_seconds", query="load_rollup")
+def load_rollup(conn, since):
+    # [(gig_id, gig_name, date, venue, singers_needed, status, count)] for gigs on or after `since` (an ISO date).
+    # Counts come from gig_status_counts, which triggers keep current on every status write, so
+    # this reads a few rows per gig instead of aggregating the whole status table. Gigs without
+    # any status have one row with status and count None.
+    return conn.execute("""
+        SELECT g.id, g.gig_name, g.date, g.venue, g.singers_needed, c.status, c.count
+        FROM gigs g
+        LEFT JOIN gig_status_counts c ON c.gig_id = g.id
+        WHERE g.date >= ?
+        ORDER BY g.date, g.id
+    """, (since,)).fetchall()
+
+
+@metrics.timed("sql_seconds", query="move_singers")
+def move_singers(conn, gig_id, moves, versions):
+    # moves is {singer_id: new_status}, versions the {singer_id: version} the booker was looking at.
+    # All moves commit together or, if any row changed underneath (or another gig booked one of the
+    # singers that day, which the triggers reject), none do and False is returned.
+    params = [(status, gig_id, sid, versions[sid]) for sid, status in moves.items()]
+    try:
+        with conn:
+            if conn.executemany(MOVE_STATUS, params).rowcount != len(params):
+                raise StaleWrite()
+    except (StaleWrite, sqlite3.IntegrityError):
+        return False
+    return True
+
+
+@metrics.timed("sql_seconds", query="add_gig")
+def add_gig(conn, client_name, gig_name, date, venue, singers_needed=1):
+    with conn:
+        conn.execute("INSERT INTO gigs (client_name, gig_name, date, venue, singers_needed) VALUES (?, ?, ?, ?, ?)",
+                     (client_name, gig_name, date, venue, singers_needed))
+
+
+@metrics.timed("sql_seconds", query="booked_elsewhere")
+def booked_elsewhere(conn, gig_id, singer_ids):
+    # {singer_id: other gig's name} for singers already Booked on another gig on this gig's date;
+    # booking them here would be a double booking
+    if not singer_ids:
+        return {}
+    rows = conn.execute(f"""
+        SELECT o.singer_id, g.gig_name
+        FROM gig_singer_status o JOIN gigs g ON g.id = o.gig_id
+        WHERE o.status = 'Booked' AND o.gig_id != ? AND o.singer_id IN ({",".join("?" * len(singer_ids))})
+          AND g.date = (SELECT date FROM gigs WHERE id = ?)
+    """, [gig_id, *singer_ids, gig_id]).fetchall()
+    return dict(rows)
+
+
+@metrics.timed("sql_seconds", query="add_singer")
+def add_singer(conn, first_name, last_name, email):
+    with conn:
+        conn.execute("INSERT INTO singers (first_name, last_name, email) VALUES (?, ?, ?)",
+                     (first_name, last_name, email))
+
+
+def match_query(text):
+    # Free text to an FTS5 MATCH expression: every word must match as a prefix ("jo sm" finds
+    # "John Smith"). Words are quoted so FTS syntax like AND, NEAR or "-" in input is taken literally.
+    words = [word.replace('"', '""') for word in text.split()]
+    return " ".join(f'"{word}"*' for word in words) or None
+
+
+def short_query(text):
+    # True when a search only ranks SHORT_QUERY_CANDIDATES matches rather than all of them
+    words = text.split()
+    return len(words) == 1 and len(words[0]) <= 2
+
+
+def _candidates(text):
+    # LIMIT for the match scan that feeds bm25; -1 is no limit in SQLite
+    return SHORT_QUERY_CANDIDATES if short_query(text) else -1
+
+
+@metrics.timed("sql_seconds", query="search_singers")
+def search_singers(conn, text, limit=SEARCH_LIMIT):
+    # [(id, first_name, last_name, email)], best bm25 match first
+    query = match_query(text)
+    if query is None:
+        return []
+    return conn.execute("""
+        SELECT s.id, s.first_name, s.last_name, s.email
+        FROM (SELECT rowid, rank FROM singers_fts WHERE singers_fts MATCH ? LIMIT ?) f
+        JOIN singers s ON s.id = f.rowid
+        ORDER BY f.rank LIMIT ?
+    """, (query, _candidates(text), limit)).fetchall()
+
+
+@metrics.timed("sql_seconds", query="search_gigs")
+def search_gigs(conn, text, limit=SEARCH_LIMIT):
+    # [(id, gig_name, client_name, date, venue)], best bm25 match first
+    query = match_query(text)
+    if query is None:
+        return []
+    return conn.execute("""
+        SELECT g.id, g.gig_name, g.client_name, g.date, g.venue
+        FROM (SELECT rowid, rank FROM gigs_fts WHERE gigs_fts MATCH ? LIMIT ?) f
+        JOIN gigs g ON g.id = f.rowid
+        ORDER BY f.rank LIMIT ?
+    """, (query, _candidates(text), limit)).fetchall()
+
+
+@metrics.timed("sql_seconds", query="search_documents")
+def search_documents(conn, text, limit=SEARCH_LIMIT):
+    # [(id, gig_id, name, snippet)], best bm25 match first; matches in the snippet are wrapped in **.
+    # Snippets re-tokenize the whole document, so they are only built for the rows returned.
+    query = match_query(text)
+    if query is None:
+        return []
+    return conn.execute("""
+        SELECT d.id, d.gig_id, d.name, snippet(documents_fts, 1, '**', '**', '…', 12)
+        FROM documents_fts f JOIN documents d ON d.id = f.rowid
+        WHERE documents_fts MATCH ? AND f.rowid IN (
+            SELECT rowid FROM (SELECT rowid, rank FROM documents_fts WHERE documents_fts MATCH ? LIMIT ?)
+            ORDER BY rank LIMIT ?)
+        ORDER BY f.rank
+    """, (query, query, _candidates(text), limit)).fetchall()
+
+
+@metrics.timed("sql_seconds", query="list_gigs")
+def list_gigs(conn, since=""):
+    # [(id, gig_name, date)] in date order; ids, not names, identify a gig
+    return conn.execute("SELECT id, gig_name, date FROM gigs WHERE date >= ? ORDER BY date, id", (since,)).fetchall()
+
+
+@metrics.timed("sql_seconds", query="add_document")
+def add_document(conn, gig_id, name, content, uploaded):
+    with conn:
+        conn.execute("INSERT INTO documents (gig_id, name, uploaded, content) VALUES (?, ?, ?, ?)",
+                     (gig_id, name, uploaded, content))
@@ -0,0 +1,172 @@
+import codecs
+import csv
+import datetime
+import io
+import time
+from collections import namedtuple
+
+from sales_suite import metrics
+
+# Rows are validated, deduplicated and inserted this many at a time, one transaction per chunk
+CHUNK_ROWS = 5000
+DATE_FORMATS = ["%Y-%m-%d", "%m/%d/%Y"]
+
+# Header spellings seen in rosters, mapped to column names; other headers are normalized to snake_case
+ALIASES = {
+    "first": "first_name", "firstname": "first_name",
+    "last": "last_name", "lastname": "last_name", "surname": "last_name",
+    "e-mail": "email", "email_address": "email",
+    "client": "client_name", "gig": "gig_name", "name": "gig_name", "needed": "singers_needed",
+}
+
+# rows: input rows read; inserted: new records; duplicates: rows already in the database or earlier in
+# the file; rejects: [(row_number, reason)] with spreadsheet numbering (the header is row 1); error: why
+# reading stopped early (rows and inserted then cover what was committed before it), or None
+ImportResult = namedtuple("ImportResult", ["rows", "inserted", "duplicates", "rejects", "seconds", "error"])
+
+
+def _cp1252(error):
+    # Excel on Windows saves CSV as Windows-1252, so bytes that aren't valid UTF-8 are read as that
+    # instead of failing the import part-way through
+    return error.object[error.start:error.end].decode("cp1252", errors="replace"), error.end
+
+
+codecs.register_error("gig_import.cp1252", _cp1252)
+
+
+def _column(header):
+    name = str(header or "").strip().lower().replace(" ", "_")
+    return ALIASES.get(name, name)
+
+
+def _text(value):
+    return "" if value is None else str(value).strip()
+
+
+def iter_records(file):
+    # Yields {column: value} per data row; CSV is read line by line and XLSX through a read-only
+    # workbook, so neither is loaded whole
+    if file.name.lower().endswith(".xlsx"):
+        from openpyxl import load_workbook
+        wb = load_workbook(file, read_only=True, data_only=True)
+        rows = wb.active.iter_rows(values_only=True)
+        columns = [_column(header) for header in next(rows, ())]
+        try:
+            for row in rows:
+                yield dict(zip(columns, row))
+        finally:
+            wb.close()
+    else:
+        text = io.TextIOWrapper(file, encoding="utf-8-sig", errors="gig_import.cp1252", newline="")
+        try:
+            reader = csv.reader(text)
+            columns = [_column(header) for header in next(reader, ())]
+            for row in reader:
+                yield dict(zip(columns, row))
+        finally:
+            text.detach()
+
+
+def parse_date(value):
+    # ISO text, US month/day/year text, or the datetime openpyxl returns for date cells
+    if isinstance(value, (datetime.datetime, datetime.date)):
+        return value.strftime("%Y-%m-%d")
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.datetime.strptime(_text(value), fmt).strftime("%Y-%m-%d")
+        except ValueError:
+            pass
+    return None
+
+
+def _singer(record):
+    # (row, dedupe key) or (None, reason)
+    first_name, last_name, email = _text(record.get("first_name")), _text(record.get("last_name")), _text(record.get("email"))
+    if not (first_name and last_name):
+        return None, "missing first or last name"
+    if "@" not in email:
+        return None, f"invalid email '{email}'"
+    return (first_name, last_name, email), email.lower()
+
+
+def _gig(record):
+    gig_name, client_name, venue = _text(record.get("gig_name")), _text(record.get("client_name")), _text(record.get("venue"))
+    if not gig_name:
+        return None, "missing gig name"
+    date = parse_date(record.get("date"))
+    if date is None:
+        return None, f"invalid date '{_text(record.get('date'))}'"
+    needed = record.get("singers_needed")
+    if isinstance(needed, float) and needed.is_integer():
+        needed = int(needed)  # numeric spreadsheet cells
+    needed = _text(needed) or "1"
+    if not needed.isdigit() or int(needed) < 1:
+        return None, f"invalid singers_needed '{needed}'"
+    return (client_name, gig_name, date, venue, int(needed)), (client_name.lower(), gig_name.lower(), date, venue.lower())
+
+
+def _singer_keys(conn):
+    return {email.lower() for email, in conn.execute("SELECT email FROM singers WHERE email IS NOT NULL")}
+
+
+def _gig_keys(conn):
+    return {(client.lower(), name.lower(), date, venue.lower())
+            for client, name, date, venue in conn.execute(
+                "SELECT IFNULL(client_name, ''), IFNULL(gig_name, ''), date, IFNULL(venue, '') FROM gigs")}
+
+
+def _import(conn, file, parse, existing, insert, progress):
+    start = time.perf_counter()
+    seen = existing(conn)
+    rows = inserted = duplicates = 0
+    rejects = []
+    error = None
+    records = iter_records(file)
+    while error is None:
+        chunk = []
+        try:
+            for record in records:
+                chunk.append(record)
+                if len(chunk) == CHUNK_ROWS:
+                    break
+        except Exception as e:
+            # A corrupt or mislabelled file can fail anywhere in the parser; the rows read before the
+            # failure are still imported and earlier chunks stay committed
+            error = str(e) or type(e).__name__
+            if rows or chunk:
+                error += f" (after row {rows + len(chunk) + 1})"
+        if not chunk:
+            break
+        batch = []
+        for number, record in enumerate(chunk, rows + 2):
+            if not any(_text(value) for value in record.values()):
+                continue  # blank line
+            row, key = parse(record)
+            if row is None:
+                rejects.append((number, key))
+            elif key in seen:
+                duplicates += 1
+            else:
+                seen.add(key)
+                batch.append(row)
+        with conn:
+            conn.executemany(insert, batch)
+        rows += len(chunk)
+        inserted += len(batch)
+        if progress:
+            progress(rows)
+    return ImportResult(rows, inserted, duplicates, rejects, time.perf_counter() - start, error)
+
+
+@metrics.timed("import_seconds", kind="singers")
+def import_singers(conn, file, progress=None):
+    # Singers are deduplicated by email, case-insensitively, against the database and the file itself
+    return _import(conn, file, _singer, _singer_keys,
+                   "INSERT INTO singers (first_name, last_name, email) VALUES (?, ?, ?)", progress)
+
+
+@metrics.timed("import_seconds", kind="gigs")
+def import_gigs(conn, file, progress=None):
+    # Gigs are duplicates when client, name, date and venue all match; singers_needed is optional (default 1)
+    return _import(conn, file, _gig, _gig_keys,
+                   "INSERT INTO gigs (client_name, gig_name, date, venue, singers_needed) VALUES (?, ?, ?, ?, ?)", progress)
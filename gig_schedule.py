@@ -0,0 +1,143 @@
+import sqlite3
+from collections import defaultdict, namedtuple
+
+from sales_suite import metrics
+
+# Statuses the solver may turn into Booked, most preferred first
+CANDIDATE_STATUSES = ["Available", "Possible"]
+
+# One proposed booking; from_status is what the row held when the plan was made
+Booking = namedtuple("Booking", ["gig_id", "singer_id", "from_status"])
+# bookings: [Booking]; open_slots: {gig_id: seats still unfilled after the plan}
+Plan = namedtuple("Plan", ["bookings", "open_slots"])
+
+
+class StalePlan(Exception):
+    pass
+
+
+@metrics.timed("sql_seconds", query="double_bookings")
+def double_bookings(conn, since=""):
+    # [(singer_id, singer name, date, gig_id, gig_name, other_gig_id, other_gig_name)] for singers Booked
+    # on two gigs the same day; each pair is reported once. Both sides read the Booked-only partial index
+    # (pinned, since without ANALYZE stats the planner prefers joining through gigs.date, ~4x slower),
+    # pair rows by singer and then compare dates, so non-Booked statuses are never scanned.
+    return conn.execute("""
+        SELECT a.singer_id, s.first_name || ' ' || s.last_name, ga.date, ga.id, ga.gig_name, gb.id, gb.gig_name
+        FROM gig_singer_status a INDEXED BY idx_gig_singer_status_booked
+        JOIN gigs ga ON ga.id = a.gig_id
+        JOIN gig_singer_status b INDEXED BY idx_gig_singer_status_booked ON b.singer_id = a.singer_id AND b.status = 'Booked' AND b.gig_id > a.gig_id
+        JOIN gigs gb ON gb.id = b.gig_id AND gb.date = ga.date
+        JOIN singers s ON s.id = a.singer_id
+        WHERE a.status = 'Booked' AND ga.date >= ?
+        ORDER BY ga.date, a.singer_id
+    """, (since,)).fetchall()
+
+
+def _match(capacity, edges):
+    # Bipartite b-matching of singers to gig seats for one date. edges is [(singer, gig, preference)],
+    # lower preference better. Singers are placed greedily in preference order, then augmenting paths
+    # (Kuhn's algorithm with gig capacities) place the rest; an augmenting path only re-seats
+    # singers already placed, so the result is a maximum matching. Returns {singer: gig}.
+    options = defaultdict(list)
+    for singer, gig, preference in sorted(edges, key=lambda edge: edge[2]):
+        options[singer].append(gig)
+    seated = defaultdict(list)
+    assigned = {}
+    for singer, gigs in options.items():
+        for gig in gigs:
+            if len(seated[gig]) < capacity[gig]:
+                seated[gig].append(singer)
+                assigned[singer] = gig
+                break
+
+    def augment(singer):
+        # Depth-first search for an augmenting path, with an explicit stack since a long chain of
+        # re-seats would exceed Python's recursion limit. A frame is [singer, their untried gigs, the
+        # full gig being tried, the singers seated there still to try re-seating elsewhere].
+        visited = set()
+        stack = [[singer, iter(options[singer]), None, None]]
+        while stack:
+            frame = stack[-1]
+            if frame[3] is not None:
+                other = next(frame[3], None)
+                if other is not None:
+                    stack.append([other, iter(options[other]), None, None])
+                    continue
+                frame[2] = frame[3] = None
+            gig = next((gig for gig in frame[1] if gig not in visited), None)
+            if gig is None:
+                stack.pop()
+                continue
+            visited.add(gig)
+            if len(seated[gig]) < capacity[gig]:
+                # Seat the top singer in the free seat, then each singer below in the seat vacated above it
+                seated[gig].append(frame[0])
+                assigned[frame[0]] = gig
+                for below, above in zip(stack[-2::-1], stack[:0:-1]):
+                    seated[below[2]].remove(above[0])
+                    seated[below[2]].append(below[0])
+                    assigned[below[0]] = below[2]
+                return True
+            frame[2], frame[3] = gig, iter(seated[gig])
+        return False
+
+    free = sum(capacity[gig] for gig in {gig for gigs in options.values() for gig in gigs}) - len(assigned)
+    for singer in options:
+        if not free:
+            break
+        if singer not in assigned and augment(singer):
+            free -= 1
+    return assigned
+
+
+@metrics.timed("schedule_seconds", step="propose")
+def propose(conn, since):
+    # Plans Booked assignments for every gig on or after `since` with open seats (singers_needed minus
+    # those already Booked), from singers marked Available or Possible on it. A singer is booked at
+    # most once per date and never on a date they are already Booked; dates are solved independently.
+    booked = {gig_id: count for gig_id, count in conn.execute(
+        "SELECT gig_id, count FROM gig_status_counts WHERE status = 'Booked'")}
+    gigs = conn.execute("SELECT id, date, singers_needed FROM gigs WHERE date >= ?", (since,)).fetchall()
+    capacity = {gig_id: max(needed - booked.get(gig_id, 0), 0) for gig_id, _, needed in gigs}
+    busy = set(conn.execute("""
+        SELECT s.singer_id, g.date FROM gig_singer_status s JOIN gigs g ON g.id = s.gig_id
+        WHERE s.status = 'Booked' AND g.date >= ?
+    """, (since,)).fetchall())
+
+    by_date = defaultdict(list)
+    statuses = {}
+    for gig_id, date, singer_id, status in conn.execute(f"""
+        SELECT g.id, g.date, s.singer_id, s.status FROM gigs g JOIN gig_singer_status s ON s.gig_id = g.id
+        WHERE g.date >= ? AND s.status IN ({",".join("?" * len(CANDIDATE_STATUSES))})
+    """, (since, *CANDIDATE_STATUSES)):
+        if capacity[gig_id] and (singer_id, date) not in busy:
+            by_date[date].append((singer_id, gig_id, CANDIDATE_STATUSES.index(status)))
+            statuses[gig_id, singer_id] = status
+
+    bookings = []
+    for date, edges in by_date.items():
+        for singer_id, gig_id in _match(capacity, edges).items():
+            bookings.append(Booking(gig_id, singer_id, statuses[gig_id, singer_id]))
+    filled = defaultdict(int)
+    for booking in bookings:
+        filled[booking.gig_id] += 1
+    open_slots = {gig_id: seats - filled[gig_id] for gig_id, seats in capacity.items() if seats - filled[gig_id] > 0}
+    return Plan(sorted(bookings), open_slots)
+
+
+@metrics.timed("schedule_seconds", step="apply")
+def apply_plan(conn, plan):
+    # Writes every booking in one transaction. Each row must still hold the status it was planned
+    # from; if any changed (or a double booking slipped in meanwhile) nothing is written and False
+    # is returned, so the caller can propose again.
+    params = [(booking.gig_id, booking.singer_id, booking.from_status) for booking in plan.bookings]
+    try:
+        with conn:
+            updated = conn.executemany("""UPDATE gig_singer_status SET status = 'Booked', version = version + 1
+                                          WHERE gig_id = ? AND singer_id = ? AND status = ?""", params).rowcount
+            if updated != len(params):
+                raise StalePlan()
+    except (StalePlan, sqlite3.IntegrityError):
+        return False
+    return True
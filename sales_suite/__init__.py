@@ -0,0 +1,2 @@
+# Job search, news, document extraction and LLM summarization services behind the Sales Enablement
+# Suite. Nothing here imports Streamlit; the UI lives in sales_suite.ui and batch mode in sales_suite.batch.
@@ -0,0 +1,113 @@
+import argparse
+import os
+import sys
+
+from . import completion, export, extraction, news, results_store, saved_searches, search, summarizer
+
+# Keys come from the environment in batch mode (the UI reads them from Streamlit secrets)
+ENV_KEYS = {"openrouter": "OPENROUTER_API_KEY", "openai": "OPENAI_API_KEY"}
+
+
+def run_search(companies, titles, industries=(), city="", max_results=50, api_key="", url=search.JSEARCH_URL, mock=False):
+    # The job search pipeline without the UI; returns (ResultsStore, [QueryResult])
+    queries = search.build_queries(list(companies), list(titles))
+    if mock:
+        results = search.mock_results(queries, max_results)
+    else:
+        results = search.fetch_unique(queries, list(industries), city, search.rapidapi_headers(api_key), max_results, url=url)
+    store = results_store.ResultsStore()
+    query_results = []
+    for result, new_jobs in results:
+        query_results.append(result)
+        store.extend([search.job_row(job) for job in new_jobs])
+    return store, query_results
+
+
+def summarize_file(path, task="summary", provider="openrouter", api_key="", stats=None):
+    # Extracts a .txt/.pdf/.docx file and yields the task's output as it streams in
+    text = extraction.cached_extract_text(extraction.open_document(path))
+    condensed, _ = summarizer.condense(text, completion.completer(provider, api_key))
+    yield from completion.stream(provider, api_key, f"{summarizer.TASKS[task]}\n{condensed}", stats=stats)
+
+
+def _search_command(args):
+    store, results = run_search(search.split_terms(args.company), search.split_terms(args.title), search.split_terms(args.industry),
+                                args.city, args.max_results, os.environ.get("RAPIDAPI_KEY", ""), args.url, args.mock)
+    for result in results:
+        if result.error:
+            print(f"API error for query '{result.query}': {result.error}", file=sys.stderr)
+    fmt = args.out.rsplit(".", 1)[-1]
+    order = range(len(store))
+    if args.profile:
+        # Most relevant to the profile document first
+        order = store.rank({}, extraction.cached_extract_text(extraction.open_document(args.profile)))
+    with export.export_file(store.df, order, fmt) as exported, open(args.out, "wb") as out:
+        out.write(exported.read())
+    print(f"{len(store)} postings written to {args.out}")
+
+
+def _news_command(args):
+    for company, entries in news.fetch_news(search.split_terms(args.company), args.limit).items():
+        print(f"# {company}")
+        if isinstance(entries, Exception):
+            print(f"error: {entries}")
+            continue
+        for entry in entries:
+            print(f"- {entry['title']} <{entry['link']}>")
+
+
+def _summarize_command(args):
+    api_key = os.environ.get(ENV_KEYS[args.provider], "")
+    if not api_key:
+        sys.exit(f"Set {ENV_KEYS[args.provider]} to use {completion.PROVIDERS[args.provider].label}")
+    stats = {}
+    for delta in summarize_file(args.file, args.task, args.provider, api_key, stats):
+        print(delta, end="", flush=True)
+    print()
+    print(completion.describe_stream(stats), file=sys.stderr)
+
+
+def _refresh_command(args):
+    headers = search.rapidapi_headers(os.environ.get("RAPIDAPI_KEY", ""))
+    print(f"Refreshed {saved_searches.refresh_due(saved_searches.connect(args.db), headers, args.url)} saved searches")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m sales_suite", description="Run the Sales Enablement Suite pipelines without the UI.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    p = commands.add_parser("search", help="search job postings and export them")
+    p.add_argument("--company", default="", help="comma-separated company names")
+    p.add_argument("--title", default="", help="comma-separated job titles")
+    p.add_argument("--industry", default="")
+    p.add_argument("--city", default="")
+    p.add_argument("--max-results", type=int, default=50)
+    p.add_argument("--out", default="job_results.csv", help="output file; .csv, .xlsx or .parquet")
+    p.add_argument("--url", default=search.JSEARCH_URL)
+    p.add_argument("--mock", action="store_true", help="use mock data instead of the API")
+    p.add_argument("--profile", help="a .txt, .pdf or .docx file to rank the postings against")
+    p.set_defaults(run=_search_command)
+
+    p = commands.add_parser("news", help="print top news for companies")
+    p.add_argument("--company", required=True, help="comma-separated company names")
+    p.add_argument("--limit", type=int, default=news.TOP_N)
+    p.set_defaults(run=_news_command)
+
+    p = commands.add_parser("summarize", help="summarize a .txt, .pdf or .docx file, or draft an account plan from it")
+    p.add_argument("file")
+    p.add_argument("--task", choices=list(summarizer.TASKS), default="summary")
+    p.add_argument("--provider", choices=list(completion.PROVIDERS), default="openrouter")
+    p.set_defaults(run=_summarize_command)
+
+    p = commands.add_parser("refresh", help="refresh saved searches that are due (e.g. from cron)")
+    p.add_argument("--db", default=saved_searches.DB_PATH)
+    p.add_argument("--url", default=search.JSEARCH_URL)
+    p.set_defaults(run=_refresh_command)
+
+    args = parser.parse_args(argv)
+    if args.command == "search" and not (args.company or args.title or args.industry):
+        parser.error("search needs at least one of --company, --title or --industry")
+    # Checked before searching, so a typo in --out doesn't cost API quota
+    if args.command == "search" and args.out.rsplit(".", 1)[-1] not in export.available_formats():
+        parser.error(f"unsupported --out format '{args.out.rsplit('.', 1)[-1]}'; use one of {', '.join(export.available_formats())}")
+    args.run(args)
@@ -0,0 +1,134 @@
+import json
+import time
+from collections import deque, namedtuple
+
+from . import http_client, metrics
+from .response_cache import ResponseCache, content_key
+
+OPENROUTER_URL = "https://openrouter.ai/api/v1/chat/completions"
+OPENAI_URL = "https://api.openai.com/v1/chat/completions"
+# Long prompts can take a while to produce the first token, so reads get more slack than other calls
+TIMEOUT = (http_client.CONNECT_TIMEOUT, 120)
+
+# Both providers speak the OpenAI chat completions protocol, so one code path serves either
+Provider = namedtuple("Provider", ["label", "url", "model", "headers"])
+PROVIDERS = {
+    "openrouter": Provider("OpenRouter", OPENROUTER_URL, "mistralai/mistral-7b-instruct", {
+        "HTTP-Referer": "http://localhost",  # Required by OpenRouter
+        "X-Title": "Sales Enablement App"
+    }),
+    "openai": Provider("OpenAI", OPENAI_URL, "gpt-4", {}),
+}
+
+# Completions are keyed by (model, prompt, temperature); an identical request is answered locally
+cache = ResponseCache("completions", ttl=30 * 86400, stale_ttl=0, max_bytes=50 * 1024 * 1024)
+
+# Timing of the most recent streamed completions in this process
+recent_streams = deque(maxlen=100)
+
+
+def cached_completion(model, prompt, temperature, complete):
+    def timed_complete():
+        with metrics.span("completion_seconds", model=model, mode="blocking"):
+            return complete()
+
+    result, _ = cache.get_or_fetch(content_key(model, prompt, temperature), timed_complete)
+    return result
+
+
+def stream_chat(url, headers, model, prompt, temperature=0.3):
+    # Yields content deltas from an OpenAI-compatible chat completions endpoint using server-sent events
+    payload = {
+        "model": model,
+        "messages": [{"role": "user", "content": prompt}],
+        "temperature": temperature,
+        "stream": True
+    }
+    with http_client.post(url, headers=headers, json=payload, stream=True, timeout=TIMEOUT) as response:
+        response.raise_for_status()
+        # SSE is always UTF-8; without a charset in Content-Type requests would decode it as ISO-8859-1
+        response.encoding = "utf-8"
+        # chunk_size=None hands over bytes as they arrive instead of waiting to fill a 512-byte buffer
+        for line in response.iter_lines(chunk_size=None, decode_unicode=True):
+            # Blank keep-alives and ": comment" lines (OpenRouter sends these while queued) carry no data
+            if not line or not line.startswith("data:"):
+                continue
+            data = line[5:].strip()
+            if data == "[DONE]":
+                break
+            choices = json.loads(data).get("choices") or [{}]
+            delta = choices[0].get("delta", {}).get("content")
+            if delta:
+                yield delta
+
+
+def provider_headers(provider, api_key):
+    return {"Authorization": f"Bearer {api_key}", "Content-Type": "application/json", **PROVIDERS[provider].headers}
+
+
+def chat(url, headers, model, prompt, temperature=0.3):
+    # One blocking chat completion; returns the reply text
+    payload = {
+        "model": model,
+        "messages": [{"role": "user", "content": prompt}],
+        "temperature": temperature
+    }
+    response = http_client.post(url, headers=headers, json=payload, timeout=TIMEOUT)
+    response.raise_for_status()
+    return response.json()["choices"][0]["message"]["content"]
+
+
+def completer(provider, api_key, temperature=0.3):
+    # complete(prompt) -> str for the provider, answered from the completion cache when possible
+    p = PROVIDERS[provider]
+    headers = provider_headers(provider, api_key)
+    return lambda prompt: cached_completion(p.model, prompt, temperature, lambda: chat(p.url, headers, p.model, prompt, temperature))
+
+
+def stream(provider, api_key, prompt, temperature=0.3, stats=None):
+    # stream_completion for a configured provider
+    p = PROVIDERS[provider]
+    return stream_completion(p.url, provider_headers(provider, api_key), p.model, prompt, temperature, stats)
+
+
+def stream_completion(url, headers, model, prompt, temperature=0.3, stats=None):
+    # Cached, instrumented wrapper around stream_chat; a cache hit yields the stored text in one piece.
+    # stats is filled with ttft (s), tokens (deltas received), elapsed (s), tokens_per_sec and cached.
+    stats = {} if stats is None else stats
+    key = content_key(model, prompt, temperature)
+    start = time.perf_counter()
+    cached, _, size = cache.lookup(key)
+    if cached is not None:
+        cache.count("hits")
+        cache.count("bytes_saved", size)
+        stats.update(ttft=time.perf_counter() - start, tokens=0, elapsed=time.perf_counter() - start, tokens_per_sec=0.0, cached=True)
+        yield cached
+        return
+
+    cache.count("misses")
+    parts = []
+    for delta in stream_chat(url, headers, model, prompt, temperature):
+        if not parts:
+            stats["ttft"] = time.perf_counter() - start
+        parts.append(delta)
+        yield delta
+    elapsed = time.perf_counter() - start
+    generating = elapsed - stats.get("ttft", elapsed)
+    stats.update(
+        ttft=stats.get("ttft", elapsed),
+        tokens=len(parts),
+        elapsed=elapsed,
+        tokens_per_sec=len(parts) / generating if generating > 0 else 0.0,
+        cached=False
+    )
+    recent_streams.append({"model": model, **stats})
+    metrics.observe("completion_ttft_seconds", stats["ttft"], model=model)
+    metrics.observe("completion_seconds", elapsed, model=model, mode="stream")
+    metrics.inc("completion_tokens_total", len(parts), model=model)
+    cache.store(key, "".join(parts))
+
+
+def describe_stream(stats):
+    if stats.get("cached"):
+        return "Served from completion cache."
+    return f"First token after {stats['ttft']:.2f}s · {stats['tokens']} tokens in {stats['elapsed']:.1f}s ({stats['tokens_per_sec']:.1f} tokens/s)"
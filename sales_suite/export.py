@@ -0,0 +1,76 @@
+import importlib.util
+import io
+import tempfile
+
+from . import metrics
+
+CHUNK_ROWS = 5000
+LABELS = {"xlsx": "Excel", "csv": "CSV", "parquet": "Parquet"}
+MIME_TYPES = {
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    "csv": "text/csv",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+
+def available_formats():
+    # Parquet needs the optional pyarrow package; find_spec checks for it without importing it
+    return ["xlsx", "csv"] + (["parquet"] if importlib.util.find_spec("pyarrow") is not None else [])
+
+
+def _chunks(df, order):
+    for start in range(0, len(order), CHUNK_ROWS):
+        yield df.iloc[order[start:start + CHUNK_ROWS]]
+
+
+def write_xlsx(df, order, out):
+    # write_only workbooks stream rows to the zip instead of building every cell in memory
+    from openpyxl import Workbook
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Job Results")
+    ws.append(list(df.columns))
+    for chunk in _chunks(df, order):
+        for row in chunk.astype(object).itertuples(index=False, name=None):
+            ws.append(list(row))
+    wb.save(out)
+
+
+def write_csv(df, order, out):
+    text = io.TextIOWrapper(out, encoding="utf-8", newline="")
+    header = True
+    for chunk in _chunks(df, order):
+        chunk.to_csv(text, index=False, header=header)
+        header = False
+    if header:
+        # No rows selected: still write the header, as the other formats do
+        df.iloc[:0].to_csv(text, index=False)
+    text.flush()
+    text.detach()
+
+
+def write_parquet(df, order, out):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    writer = None
+    for chunk in _chunks(df, order):
+        table = pa.Table.from_pandas(chunk, preserve_index=False)
+        if writer is None:
+            writer = pq.ParquetWriter(out, table.schema)
+        writer.write_table(table.cast(writer.schema))
+    if writer is None:
+        pq.write_table(pa.Table.from_pandas(df.iloc[:0], preserve_index=False), out)
+    else:
+        writer.close()
+
+
+WRITERS = {"xlsx": write_xlsx, "csv": write_csv, "parquet": write_parquet}
+
+
+def export_file(df, order, fmt):
+    # Writes the rows at `order` to an anonymous temp file in chunks and returns it rewound;
+    # callers read it inside `with` so the file is closed (and deleted) promptly
+    out = tempfile.TemporaryFile()
+    with metrics.span("export_seconds", format=fmt):
+        WRITERS[fmt](df, order, out)
+    out.seek(0)
+    return out
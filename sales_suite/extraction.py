@@ -0,0 +1,181 @@
+import io
+import os
+import codecs
+import hashlib
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from . import metrics
+from .response_cache import ResponseCache, content_key
+
+PARALLEL_MIN_PAGES = 16
+MAX_WORKERS = os.cpu_count() or 2
+TEXT_CHUNK = 64 * 1024
+DOCX_BLOCK_LINES = 200
+
+# Keyed by the SHA-256 of the uploaded bytes, so the same file is only ever extracted once
+cache = ResponseCache("documents", ttl=30 * 86400, stale_ttl=0, max_bytes=200 * 1024 * 1024)
+
+# The last PDF a pool worker parsed, as (digest, reader), so its other page ranges skip the parse
+_worker_reader = None
+
+# Started on first use and kept: workers that aren't forked take a while to boot
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _mp_context():
+    # Workers are not forked from this process: that would copy the Streamlit server's threads and
+    # held locks into them, which can deadlock. Where available a fork server, with the PDF parser
+    # preloaded, starts them instead.
+    if "forkserver" not in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("spawn")
+    context = multiprocessing.get_context("forkserver")
+    context.set_forkserver_preload([__name__, "PyPDF2"])
+    return context
+
+
+def _worker_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=MAX_WORKERS, mp_context=_mp_context())
+        return _pool
+
+
+def _extract_pages(data, digest, first, last):
+    global _worker_reader
+    if _worker_reader is None or _worker_reader[0] != digest:
+        import PyPDF2
+        _worker_reader = (digest, PyPDF2.PdfReader(io.BytesIO(data)))
+    pages = _worker_reader[1].pages
+    return [pages[index].extract_text() or "" for index in range(first, last)]
+
+
+def _pdf_pages(data, first, last, progress):
+    # PDF and DOCX parsers are imported on first use rather than with the module
+    global _pool
+    import PyPDF2
+    reader = PyPDF2.PdfReader(io.BytesIO(data))
+    indices = range(first, min(last, len(reader.pages)) if last else len(reader.pages))
+    total = len(indices)
+    if total < PARALLEL_MIN_PAGES or MAX_WORKERS < 2:
+        for done, index in enumerate(indices, 1):
+            text = reader.pages[index].extract_text() or ""
+            progress(done, total)
+            yield text
+        return
+
+    # Two page ranges per worker; each task carries the file, so fewer, larger ranges copy it less
+    pool = _worker_pool()
+    digest = hashlib.sha256(data).hexdigest()
+    step = -(-total // (MAX_WORKERS * 2))
+    futures = [pool.submit(_extract_pages, data, digest, start, min(start + step, indices.stop))
+               for start in range(indices.start, indices.stop, step)]
+    done = 0
+    try:
+        for future in futures:
+            texts = future.result()
+            done += len(texts)
+            progress(done, total)
+            yield from texts
+    except BrokenProcessPool:
+        # A crashed worker breaks the whole pool; the next document gets a new one
+        with _pool_lock:
+            if _pool is pool:
+                _pool = None
+        raise
+    finally:
+        # Stopping early (byte limit hit) must not wait for the remaining pages
+        for future in futures:
+            future.cancel()
+
+
+def _docx_blocks(file, progress):
+    import docx2txt
+    lines = docx2txt.process(file).split("\n")
+    total = len(lines)
+    for start in range(0, total, DOCX_BLOCK_LINES):
+        block = lines[start:start + DOCX_BLOCK_LINES]
+        progress(start + len(block), total)
+        yield "\n".join(block)
+
+
+def _text_blocks(file, progress):
+    file.seek(0, io.SEEK_END)
+    total = file.tell()
+    file.seek(0)
+    if not total:
+        return
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="ignore")
+    pending = ""
+    done = 0
+    while True:
+        chunk = file.read(TEXT_CHUNK)
+        if not chunk:
+            break
+        done += len(chunk)
+        text = pending + decoder.decode(chunk)
+        cut = text.rfind("\n")
+        progress(done, total)
+        if cut < 0:
+            pending = text
+            continue
+        pending = text[cut + 1:]
+        yield text[:cut]
+    yield pending + decoder.decode(b"", final=True)
+
+
+class NamedBytes(io.BytesIO):
+    # An in-memory file with a name, shaped like Streamlit's UploadedFile, for use outside the UI
+    def __init__(self, data, name):
+        super().__init__(data)
+        self.name = name
+
+
+def open_document(path):
+    with open(path, "rb") as f:
+        return NamedBytes(f.read(), path)
+
+
+def iter_pages(file, first_page=1, last_page=None, max_bytes=None, progress=None):
+    # Yields the document as text blocks (PDF pages, DOCX/TXT line blocks) meant to be joined with "\n".
+    # first_page/last_page are 1-based and inclusive and only apply to PDFs; max_bytes, if given,
+    # cuts the text off at that many UTF-8 bytes.
+    # progress(done, total) is called as blocks complete.
+    progress = progress or (lambda done, total: None)
+    if file.name.endswith(".txt"):
+        blocks = _text_blocks(file, progress)
+    elif file.name.endswith(".pdf"):
+        blocks = _pdf_pages(file.getvalue(), first_page - 1, last_page, progress)
+    elif file.name.endswith(".docx"):
+        blocks = _docx_blocks(file, progress)
+    else:
+        return
+
+    remaining = max_bytes
+    try:
+        for text in blocks:
+            if remaining is not None:
+                encoded = text.encode("utf-8")
+                if len(encoded) >= remaining:
+                    yield encoded[:remaining].decode("utf-8", errors="ignore")
+                    return
+                remaining -= len(encoded) + 1
+            yield text
+    finally:
+        blocks.close()
+
+
+def extract_text(file, **kwargs):
+    with metrics.span("extract_text_seconds", kind=file.name.rsplit(".", 1)[-1]):
+        return "\n".join(iter_pages(file, **kwargs))
+
+
+def cached_extract_text(file, progress=None, **limits):
+    digest = hashlib.sha256(file.getvalue()).hexdigest()
+    key = content_key(digest, file.name.rsplit(".", 1)[-1], limits)
+    text, _ = cache.get_or_fetch(key, lambda: extract_text(file, progress=progress, **limits))
+    return text
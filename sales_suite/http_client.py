@@ -0,0 +1,143 @@
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from . import metrics
+
+CONNECT_TIMEOUT = 5
+READ_TIMEOUT = 30
+POOL_SIZE = 16
+MAX_RETRIES = 3
+BACKOFF_BASE = 0.5
+# Longest we'll sleep before a retry; a longer Retry-After is returned to the caller instead
+MAX_RETRY_WAIT = 20
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+# A read timeout on any other method may mean the server is still working on (and billing) the
+# request, so for those only failures to connect are retried
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+FAILURE_THRESHOLD = 5
+RESET_SECONDS = 30
+
+
+class CircuitOpen(requests.RequestException):
+    pass
+
+
+class CircuitBreaker:
+    # Opens after `threshold` consecutive failures and fails fast for `reset` seconds,
+    # then lets a single trial request through: success closes it, failure reopens it
+    def __init__(self, threshold=FAILURE_THRESHOLD, reset=RESET_SECONDS):
+        self.threshold = threshold
+        self.reset = reset
+        self.failures = 0
+        self.opened_at = None
+        self.trial = False
+        self.lock = threading.Lock()
+
+    def check(self, host):
+        with self.lock:
+            if self.opened_at is None:
+                return
+            if self.trial or time.monotonic() - self.opened_at < self.reset:
+                metrics.inc("http_circuit_open_total", host=host)
+                raise CircuitOpen(f"{host} is failing; not retrying for up to {self.reset}s")
+            self.trial = True
+
+    def record(self, ok):
+        with self.lock:
+            self.trial = False
+            if ok:
+                self.failures = 0
+                self.opened_at = None
+                return
+            self.failures += 1
+            if self.failures >= self.threshold or self.opened_at is not None:
+                self.opened_at = time.monotonic()
+
+
+_sessions = {}
+_breakers = {}
+_lock = threading.Lock()
+
+
+def _host_state(host):
+    # One keep-alive session and breaker per host, shared by every session and thread in the process
+    with _lock:
+        if host not in _sessions:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=POOL_SIZE)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _sessions[host] = session
+            _breakers[host] = CircuitBreaker()
+        return _sessions[host], _breakers[host]
+
+
+def retry_after(response):
+    # Retry-After is either delta-seconds or an HTTP date
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def backoff(attempt):
+    # Full jitter, so clients that failed together don't retry together
+    return random.uniform(0, BACKOFF_BASE * 2 ** attempt)
+
+
+def request(method, url, timeout=(CONNECT_TIMEOUT, READ_TIMEOUT), retries=MAX_RETRIES, **kwargs):
+    # Like requests.request, through the host's pooled session, retrying connection errors,
+    # timeouts and 429/5xx responses. The final response is returned as-is for raise_for_status.
+    host = urlparse(url).netloc
+    session, breaker = _host_state(host)
+    for attempt in range(retries + 1):
+        breaker.check(host)
+        if attempt:
+            metrics.inc("http_retries_total", host=host)
+        try:
+            with metrics.span("http_request_seconds", host=host):
+                response = session.request(method, url, timeout=timeout, **kwargs)
+        except (requests.ConnectionError, requests.Timeout) as e:
+            breaker.record(False)
+            if attempt == retries or (isinstance(e, requests.ReadTimeout) and method.upper() not in IDEMPOTENT_METHODS):
+                raise
+            time.sleep(backoff(attempt))
+            continue
+        except Exception:
+            # Any other failure (a broken chunked body, too many redirects, ...) still ends a half-open
+            # trial; otherwise the breaker would stay open for good
+            breaker.record(False)
+            raise
+        metrics.inc("http_responses_total", host=host, status=response.status_code)
+        if response.status_code not in RETRY_STATUSES:
+            breaker.record(True)
+            return response
+        # A 429 means the provider is up, just busy, so only 5xx count against the breaker
+        breaker.record(response.status_code == 429)
+        delay = retry_after(response)
+        delay = backoff(attempt) if delay is None else delay
+        if attempt == retries or delay > MAX_RETRY_WAIT:
+            return response
+        response.close()
+        time.sleep(delay)
+
+
+def get(url, **kwargs):
+    return request("GET", url, **kwargs)
+
+
+def post(url, **kwargs):
+    return request("POST", url, **kwargs)
@@ -0,0 +1,162 @@
+import bisect
+import json
+import os
+import threading
+import time
+from functools import wraps
+
+# Upper bounds (s) of the latency histogram buckets; the last bucket is +Inf
+BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+# SUITE_METRICS=0 turns every span, counter and histogram into a flag check
+enabled = os.environ.get("SUITE_METRICS", "1") != "0"
+
+_lock = threading.Lock()
+_counters = {}
+_histograms = {}
+
+
+def enable(on=True):
+    global enabled
+    enabled = on
+
+
+def _key(name, labels):
+    return name, tuple(sorted(labels.items()))
+
+
+def inc(name, amount=1, **labels):
+    if not enabled:
+        return
+    key = _key(name, labels)
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + amount
+
+
+def observe(name, seconds, **labels):
+    if not enabled:
+        return
+    key = _key(name, labels)
+    with _lock:
+        hist = _histograms.get(key)
+        if hist is None:
+            hist = _histograms[key] = {"buckets": [0] * (len(BUCKETS) + 1), "sum": 0.0, "count": 0}
+        hist["buckets"][bisect.bisect_left(BUCKETS, seconds)] += 1
+        hist["sum"] += seconds
+        hist["count"] += 1
+
+
+class _Span:
+    def __init__(self, name, labels):
+        self.name = name
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        observe(self.name, time.perf_counter() - self.start, **self.labels)
+        if exc_type is not None:
+            inc(self.name.rsplit("_seconds", 1)[0] + "_errors_total", **self.labels)
+        return False
+
+
+class _NoSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NO_SPAN = _NoSpan()
+
+
+def span(name, **labels):
+    # with metrics.span("extract_text_seconds", kind="pdf"): ...
+    # Records the duration in a histogram and counts exceptions as <name>_errors_total.
+    return _Span(name, labels) if enabled else _NO_SPAN
+
+
+def timed(name, **labels):
+    # Decorator form of span()
+    def decorate(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not enabled:
+                return func(*args, **kwargs)
+            with _Span(name, labels):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def reset():
+    with _lock:
+        _counters.clear()
+        _histograms.clear()
+
+
+def _quantile(hist, q):
+    # Upper bound of the bucket holding the q-th observation, like Prometheus' histogram_quantile
+    target = q * hist["count"]
+    seen = 0
+    for bound, count in zip(BUCKETS + (float("inf"),), hist["buckets"]):
+        seen += count
+        if seen >= target:
+            return bound
+    return float("inf")
+
+
+def snapshot():
+    # Plain-dict view of everything recorded so far: {"counters": [...], "histograms": [...]}
+    with _lock:
+        counters = [{"name": name, "labels": dict(labels), "value": value}
+                    for (name, labels), value in sorted(_counters.items())]
+        histograms = [{"name": name, "labels": dict(labels), "count": hist["count"], "sum": hist["sum"],
+                       "buckets": list(hist["buckets"])}
+                      for (name, labels), hist in sorted(_histograms.items())]
+    for hist in histograms:
+        for q in (0.5, 0.95, 0.99):
+            hist[f"p{int(q * 100)}"] = _quantile(hist, q)
+    return {"counters": counters, "histograms": histograms}
+
+
+def to_json():
+    return json.dumps(snapshot(), default=str, indent=2)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(labels, extra=None):
+    items = list(labels.items()) + ([extra] if extra else [])
+    if not items:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in items) + "}"
+
+
+def to_prometheus():
+    # Prometheus text exposition format (version 0.0.4)
+    data = snapshot()
+    lines = []
+    typed = set()
+    for counter in data["counters"]:
+        if counter["name"] not in typed:
+            typed.add(counter["name"])
+            lines.append(f"# TYPE {counter['name']} counter")
+        lines.append(f"{counter['name']}{_labels(counter['labels'])} {counter['value']}")
+    for hist in data["histograms"]:
+        name = hist["name"]
+        if name not in typed:
+            typed.add(name)
+            lines.append(f"# TYPE {name} histogram")
+        cumulative = 0
+        for bound, count in zip(BUCKETS + ("+Inf",), hist["buckets"]):
+            cumulative += count
+            lines.append(f"{name}_bucket{_labels(hist['labels'], ('le', bound))} {cumulative}")
+        lines.append(f"{name}_sum{_labels(hist['labels'])} {hist['sum']}")
+        lines.append(f"{name}_count{_labels(hist['labels'])} {hist['count']}")
+    return "\n".join(lines) + "\n"
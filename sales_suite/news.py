@@ -0,0 +1,84 @@
+import io
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
+
+from . import http_client, metrics
+from .response_cache import ResponseCache
+
+MAX_WORKERS = 10
+TOP_N = 5
+
+# Parsed entries are fresh for 15 minutes; validators are kept for a week so expired feeds
+# can still be revalidated with a conditional GET instead of a full download
+cache = ResponseCache("news", ttl=900, stale_ttl=7 * 86400)
+
+
+def feed_url(company):
+    return f"https://news.google.com/rss/search?q={company.replace(' ', '+')}"
+
+
+@metrics.timed("rss_parse_seconds")
+def parse_top(content, limit=TOP_N):
+    # Stream the RSS items and stop once enough are read; feedparser is only the fallback for odd feeds
+    entries = []
+    try:
+        for _, elem in ET.iterparse(io.BytesIO(content)):
+            if elem.tag == "item":
+                entries.append({"title": elem.findtext("title", ""), "link": elem.findtext("link", "")})
+                if len(entries) >= limit:
+                    break
+                elem.clear()
+    except ET.ParseError:
+        entries = []
+    if not entries:
+        import feedparser
+        feed = feedparser.parse(content)
+        entries = [{"title": e.get("title", ""), "link": e.get("link", "")} for e in feed.entries[:limit]]
+    return entries
+
+
+def fetch_feed(url, limit=TOP_N, timeout=10):
+    cached, age, size = cache.lookup(url)
+    usable = cached is not None and cached["limit"] >= limit
+    if usable and age <= cache.ttl:
+        cache.count("hits")
+        cache.count("bytes_saved", size)
+        return cached["entries"][:limit]
+
+    headers = {}
+    if usable:
+        if cached.get("etag"):
+            headers["If-None-Match"] = cached["etag"]
+        if cached.get("modified"):
+            headers["If-Modified-Since"] = cached["modified"]
+    response = http_client.get(url, headers=headers, timeout=(http_client.CONNECT_TIMEOUT, timeout))
+    if response.status_code == 304 and usable:
+        cache.count("not_modified")
+        cache.store(url, cached)
+        return cached["entries"][:limit]
+    response.raise_for_status()
+
+    cache.count("misses")
+    entries = parse_top(response.content, limit)
+    cache.store(url, {
+        "etag": response.headers.get("ETag"),
+        "modified": response.headers.get("Last-Modified"),
+        "limit": limit,
+        "entries": entries
+    })
+    return entries
+
+
+def fetch_news(companies, limit=TOP_N, max_workers=MAX_WORKERS):
+    # Returns {company: entries} in input order; a failed feed maps to its exception
+    if not companies:
+        return {}
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(companies))) as pool:
+        futures = {comp: pool.submit(fetch_feed, feed_url(comp), limit) for comp in companies}
+    results = {}
+    for comp, future in futures.items():
+        try:
+            results[comp] = future.result()
+        except Exception as e:
+            results[comp] = e
+    return results
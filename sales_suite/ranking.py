@@ -0,0 +1,82 @@
+import re
+from collections import Counter
+
+import numpy as np
+
+from . import metrics
+
+# Unicode words (so "Zürich" stays one term); "+" and "#" may follow the first character, for C++ and C#
+TOKEN = re.compile(r"[^\W_][\w+#]*")
+
+
+def terms(text):
+    # Lowercased words plus adjacent-word bigrams, so "account executive" outranks postings that
+    # only mention "account" and "executive" separately
+    words = TOKEN.findall(text.lower())
+    return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+
+class RelevanceIndex:
+    # TF-IDF vectors for a growing set of documents, kept as CSR arrays (indptr, term ids, counts).
+    # The vocabulary and document frequencies are extended as documents arrive and never rebuilt;
+    # IDF is derived from them at scoring time, so earlier vectors stay valid as the corpus grows.
+    def __init__(self):
+        self.vocabulary = {}
+        self.df = np.zeros(0, dtype=np.int64)
+        self.indptr = [0]
+        self.chunks = []  # (term ids, counts) per add() call, concatenated on demand
+        self.last = None  # (profile, documents, scores) of the previous score() call
+
+    def __len__(self):
+        return len(self.indptr) - 1
+
+    def add(self, texts):
+        ids, counts = [], []
+        vocabulary = self.vocabulary
+        for text in texts:
+            # Counter does the per-term work in C; only distinct terms touch the vocabulary
+            doc = Counter(terms(text))
+            ids.extend(vocabulary.setdefault(term, len(vocabulary)) for term in doc)
+            counts.extend(doc.values())
+            self.indptr.append(self.indptr[-1] + len(doc))
+        if not ids:
+            return
+        ids, counts = np.array(ids, dtype=np.int64), np.array(counts, dtype=np.int64)
+        self.df = np.concatenate([self.df, np.zeros(len(vocabulary) - len(self.df), dtype=np.int64)])
+        self.df += np.bincount(ids, minlength=len(vocabulary))
+        self.chunks.append((ids, counts))
+
+    def _matrix(self):
+        if len(self.chunks) > 1:
+            self.chunks = [tuple(np.concatenate(parts) for parts in zip(*self.chunks))]
+        return self.chunks[0]
+
+    def vector(self, text, idf):
+        # Query weights over the current vocabulary; terms no document contains can't score and are dropped
+        ids = [self.vocabulary[term] for term in terms(text) if term in self.vocabulary]
+        query = np.zeros(len(self.vocabulary))
+        if ids:
+            unique, count = np.unique(ids, return_counts=True)
+            query[unique] = (1 + np.log(count)) * idf[unique]
+        return query
+
+    def scores(self, profile):
+        # Cosine similarity of every document to `profile`, in insertion order, in [0, 1]
+        if self.last is not None and self.last[:2] == (profile, len(self)):
+            return self.last[2]
+        with metrics.span("rank_seconds"):
+            scores = np.zeros(len(self))
+            # No chunks means no document produced a single term, so nothing can match
+            if self.chunks:
+                ids, counts = self._matrix()
+                rows = np.repeat(np.arange(len(self)), np.diff(self.indptr))
+                idf = np.log((1 + len(self)) / (1 + self.df)) + 1
+                weights = (1 + np.log(counts)) * idf[ids]
+                norms = np.sqrt(np.bincount(rows, weights ** 2, minlength=len(self)))
+                query = self.vector(profile, idf)
+                query_norm = np.linalg.norm(query)
+                if query_norm:
+                    dots = np.bincount(rows, weights * query[ids], minlength=len(self))
+                    scores = np.divide(dots, norms * query_norm, out=scores, where=norms > 0)
+        self.last = (profile, len(self), scores)
+        return scores
@@ -0,0 +1,147 @@
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+CACHE_DB = "response_cache.db"
+
+# Refreshes for stale entries run here, off the Streamlit script thread
+_revalidator = ThreadPoolExecutor(max_workers=4)
+
+
+def make_key(namespace, params):
+    # Blank values are dropped and strings are trimmed/casefolded so equivalent searches share an entry
+    normalized = {
+        k: v.strip().casefold() if isinstance(v, str) else v
+        for k, v in params.items()
+        if v not in (None, "")
+    }
+    raw = json.dumps([namespace, normalized], sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def content_key(*parts):
+    # Exact-content key for immutable results (document text, completions); no normalization
+    raw = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    def __init__(self, name, path=CACHE_DB, ttl=3600, stale_ttl=86400, max_bytes=50 * 1024 * 1024):
+        self.name = name
+        self.path = path
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_bytes = max_bytes
+        self.local = threading.local()
+        self.refreshing = set()
+        self.lock = threading.Lock()
+        conn = self._conn()
+        conn.execute(f'''CREATE TABLE IF NOT EXISTS "{name}" (
+            key TEXT PRIMARY KEY,
+            value TEXT,
+            created REAL,
+            accessed REAL,
+            size INTEGER
+        )''')
+        conn.execute(f'CREATE INDEX IF NOT EXISTS "idx_{name}_accessed" ON "{name}"(accessed)')
+        conn.execute('''CREATE TABLE IF NOT EXISTS cache_stats (
+            cache TEXT,
+            counter TEXT,
+            value INTEGER,
+            PRIMARY KEY (cache, counter)
+        )''')
+        conn.commit()
+
+    def _conn(self):
+        # One connection per thread; WAL lets other sessions and processes read while one writes
+        conn = getattr(self.local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self.local.conn = conn
+        return conn
+
+    def count(self, counter, amount=1):
+        conn = self._conn()
+        conn.execute('''INSERT INTO cache_stats (cache, counter, value) VALUES (?, ?, ?)
+                        ON CONFLICT(cache, counter) DO UPDATE SET value = value + excluded.value''',
+                     (self.name, counter, amount))
+        conn.commit()
+
+    def lookup(self, key):
+        conn = self._conn()
+        row = conn.execute(f'SELECT value, created, size FROM "{self.name}" WHERE key = ?', (key,)).fetchone()
+        if row is None:
+            return None, None, 0
+        conn.execute(f'UPDATE "{self.name}" SET accessed = ? WHERE key = ?', (time.time(), key))
+        conn.commit()
+        return json.loads(row[0]), time.time() - row[1], row[2]
+
+    def store(self, key, value):
+        raw = json.dumps(value)
+        now = time.time()
+        conn = self._conn()
+        conn.execute(f'INSERT OR REPLACE INTO "{self.name}" (key, value, created, accessed, size) VALUES (?, ?, ?, ?, ?)',
+                     (key, raw, now, now, len(raw)))
+        # LRU eviction: drop everything past the byte budget, least recently accessed first
+        conn.execute(f'''DELETE FROM "{self.name}" WHERE key IN (
+                            SELECT key FROM (
+                                SELECT key, SUM(size) OVER (ORDER BY accessed DESC) AS running FROM "{self.name}"
+                            ) WHERE running > ?
+                        )''', (self.max_bytes,))
+        conn.commit()
+
+    def _revalidate(self, key, fetch):
+        try:
+            self.store(key, fetch())
+        except Exception:
+            pass
+        finally:
+            with self.lock:
+                self.refreshing.discard(key)
+
+    def get_or_fetch(self, key, fetch, max_age=None):
+        # Returns (value, status) where status is "hit", "stale" or "miss".
+        # With max_age, anything older is refetched and stale entries are never served.
+        value, age, size = self.lookup(key)
+        if value is not None and max_age is not None:
+            if age <= max_age:
+                self.count("hits")
+                self.count("bytes_saved", size)
+                return value, "hit"
+            value = None
+        if value is not None and age <= self.ttl:
+            self.count("hits")
+            self.count("bytes_saved", size)
+            return value, "hit"
+        if value is not None and age <= self.ttl + self.stale_ttl:
+            self.count("stale")
+            self.count("bytes_saved", size)
+            with self.lock:
+                start = key not in self.refreshing
+                self.refreshing.add(key)
+            if start:
+                _revalidator.submit(self._revalidate, key, fetch)
+            return value, "stale"
+        self.count("misses")
+        value = fetch()
+        self.store(key, value)
+        return value, "miss"
+
+    def stats(self):
+        conn = self._conn()
+        counters = dict(conn.execute("SELECT counter, value FROM cache_stats WHERE cache = ?", (self.name,)).fetchall())
+        entries, size = conn.execute(f'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM "{self.name}"').fetchone()
+        return {"hits": 0, "stale": 0, "misses": 0, "bytes_saved": 0, **counters, "entries": entries, "bytes": size}
+
+    def summary(self):
+        stats = self.stats()
+        served = stats["hits"] + stats["stale"]
+        total = served + stats["misses"]
+        rate = served / total if total else 0
+        return (f"{served} hits / {stats['misses']} misses ({rate:.0%} hit rate), "
+                f"{stats['bytes_saved'] / 1024:.1f} KB saved, {stats['entries']} entries ({stats['bytes'] / 1024:.1f} KB)")
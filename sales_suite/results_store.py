@@ -0,0 +1,98 @@
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+from .ranking import RelevanceIndex
+
+COLUMNS = ["Company", "Job Title", "Location", "Link to Apply", "Description"]
+FILTER_COLUMNS = ["Company", "Location"]
+# Concatenated per row for relevance ranking
+TEXT_COLUMNS = ["Job Title", "Description"]
+
+
+class ResultsStore:
+    # Job results kept across reruns (in st.session_state) with categorical filter columns and an
+    # inverted index per filter column, so a filter change is an index intersection, not a full scan
+    def __init__(self, columns=COLUMNS, filter_columns=FILTER_COLUMNS, text_columns=TEXT_COLUMNS):
+        self.filter_columns = filter_columns
+        self.text_columns = [col for col in text_columns if col in columns]
+        self.relevance = RelevanceIndex()
+        self.df = pd.DataFrame({col: pd.Series(dtype="category" if col in filter_columns else object) for col in columns})
+        self.index = {col: {} for col in filter_columns}
+        self.orders = {}
+
+    def __len__(self):
+        return len(self.df)
+
+    def extend(self, rows):
+        if not rows:
+            return
+        self.orders = {}
+        offset = len(self.df)
+        new = pd.DataFrame(rows, columns=self.df.columns)
+        for col in self.filter_columns:
+            new[col] = new[col].astype("category")
+            for value, positions in new.groupby(col, observed=True).indices.items():
+                existing = self.index[col].get(value)
+                positions = positions + offset
+                self.index[col][value] = positions if existing is None else np.concatenate([existing, positions])
+        if offset:
+            for col in self.filter_columns:
+                combined = union_categoricals([self.df[col], new[col]], ignore_order=True)
+                self.df = self.df.assign(**{col: pd.Categorical(self.df[col], categories=combined.categories)})
+                new[col] = pd.Categorical(new[col], categories=combined.categories)
+            self.df = pd.concat([self.df, new], ignore_index=True)
+        else:
+            self.df = new
+
+    def values(self, col):
+        return list(self.index[col])
+
+    def positions(self, selections):
+        # selections maps a filter column to the allowed values; a column left at "all" costs nothing.
+        # Returns the sorted matching row positions, or None when nothing is filtered out.
+        positions = None
+        for col, selected in selections.items():
+            column_index = self.index[col]
+            if len(selected) == len(column_index):
+                continue
+            matches = [column_index[value] for value in selected if value in column_index]
+            hits = np.unique(np.concatenate(matches)) if matches else np.array([], dtype=np.intp)
+            positions = hits if positions is None else np.intersect1d(positions, hits, assume_unique=True)
+        return positions
+
+    def order(self, selections, sort_by=None, descending=False):
+        # Row positions passing the filters, sorted by one column; sort orders are cached until new rows arrive
+        positions = self.positions(selections)
+        if sort_by is None:
+            order = np.arange(len(self.df)) if positions is None else positions
+        else:
+            if sort_by not in self.orders:
+                self.orders[sort_by] = np.argsort(self.df[sort_by].astype(str).to_numpy(), kind="stable")
+            order = self.orders[sort_by]
+            if positions is not None:
+                order = order[np.isin(order, positions, assume_unique=True)]
+        return order[::-1] if descending else order
+
+    def scores(self, profile):
+        # Relevance of every row to the profile text; rows added since the last call are indexed
+        # first, so the index grows with the results instead of being rebuilt
+        indexed = len(self.relevance)
+        if indexed < len(self.df):
+            new = self.df[self.text_columns].iloc[indexed:].fillna("").astype(str)
+            self.relevance.add(" ".join(parts) for parts in zip(*(new[col] for col in self.text_columns)))
+        return self.relevance.scores(profile)
+
+    def rank(self, selections, profile):
+        # Row positions passing the filters, most relevant to the profile first
+        positions = self.positions(selections)
+        scores = self.scores(profile)
+        order = np.argsort(-scores, kind="stable")
+        if positions is not None:
+            order = order[np.isin(order, positions, assume_unique=True)]
+        return order
+
+    def window(self, order, start, size, columns=None):
+        # Only the visible slice is materialized
+        page = self.df.iloc[order[start:start + size]]
+        return page if columns is None else page[columns]
@@ -0,0 +1,184 @@
+import json
+import sqlite3
+import threading
+import time
+
+from . import metrics, search
+
+DB_PATH = "saved_searches.db"
+REFRESH_HOURS = 12
+POLL_SECONDS = 60
+# Pages cached longer than this are refetched on a refresh rather than served stale
+MAX_PAGE_AGE = 600
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS saved_searches (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT,
+    companies TEXT,
+    titles TEXT,
+    industries TEXT,
+    city TEXT,
+    max_results INTEGER,
+    interval_hours REAL,
+    last_run REAL
+);
+CREATE TABLE IF NOT EXISTS snapshots (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    search_id INTEGER,
+    run_at REAL,
+    total INTEGER,
+    added INTEGER,
+    removed INTEGER,
+    errors INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_snapshots_search ON snapshots(search_id, run_at);
+CREATE TABLE IF NOT EXISTS search_jobs (
+    search_id INTEGER,
+    job_key TEXT,
+    job TEXT,
+    first_seen REAL,
+    removed_at REAL,
+    PRIMARY KEY (search_id, job_key)
+);
+"""
+
+# A posting that reappears after being removed counts as new again
+UPSERT_JOB = """INSERT INTO search_jobs (search_id, job_key, job, first_seen) VALUES (?, ?, ?, ?)
+                ON CONFLICT(search_id, job_key) DO UPDATE SET job = excluded.job, first_seen = excluded.first_seen, removed_at = NULL"""
+
+
+# The UI shares one connection across sessions (see st.cache_resource in the apps), so its
+# write transactions are serialized; the refresher thread has a connection of its own
+_write_lock = threading.Lock()
+
+
+def connect(path=DB_PATH):
+    conn = sqlite3.connect(path, timeout=5, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def save_search(conn, name, companies, titles, industries, city, max_results, interval_hours=REFRESH_HOURS):
+    with _write_lock, conn:
+        conn.execute("""INSERT INTO saved_searches (name, companies, titles, industries, city, max_results, interval_hours)
+                        VALUES (?, ?, ?, ?, ?, ?, ?)""",
+                     (name, json.dumps(companies), json.dumps(titles), json.dumps(industries), city, max_results, interval_hours))
+
+
+def delete_search(conn, search_id):
+    with _write_lock, conn:
+        conn.execute("DELETE FROM saved_searches WHERE id = ?", (search_id,))
+        conn.execute("DELETE FROM snapshots WHERE search_id = ?", (search_id,))
+        conn.execute("DELETE FROM search_jobs WHERE search_id = ?", (search_id,))
+
+
+def list_searches(conn):
+    # Every saved search with the counts from its latest snapshot
+    rows = conn.execute("""
+        SELECT s.id, s.name, s.last_run, n.total, n.added, n.removed, n.errors
+        FROM saved_searches s
+        LEFT JOIN snapshots n ON n.id = (SELECT MAX(id) FROM snapshots WHERE search_id = s.id)
+        ORDER BY s.id
+    """).fetchall()
+    return [dict(zip(["id", "name", "last_run", "total", "added", "removed", "errors"], row)) for row in rows]
+
+
+def current_jobs(conn, search_id):
+    # Postings from the latest snapshot as (job, is_new) pairs, newest first
+    rows = conn.execute("""
+        SELECT job, first_seen >= COALESCE((SELECT last_run FROM saved_searches WHERE id = ?), 0)
+        FROM search_jobs WHERE search_id = ? AND removed_at IS NULL
+        ORDER BY first_seen DESC
+    """, (search_id, search_id)).fetchall()
+    return [(json.loads(job), bool(is_new)) for job, is_new in rows]
+
+
+def removed_jobs(conn, search_id):
+    # Postings that dropped out in the latest snapshot
+    rows = conn.execute("""
+        SELECT job FROM search_jobs
+        WHERE search_id = ? AND removed_at = (SELECT last_run FROM saved_searches WHERE id = ?)
+    """, (search_id, search_id)).fetchall()
+    return [json.loads(job) for job, in rows]
+
+
+@metrics.timed("saved_search_refresh_seconds")
+def refresh(conn, search_id, headers, url=search.JSEARCH_URL):
+    # Runs one saved search with the same requests as the job search form and diffs the postings
+    # against the previous snapshot; only added and removed postings are written
+    companies, titles, industries, city, max_results = conn.execute(
+        "SELECT companies, titles, industries, city, max_results FROM saved_searches WHERE id = ?", (search_id,)).fetchone()
+    queries = search.build_queries(json.loads(companies), json.loads(titles))
+    fetched = {}
+    errors = 0
+    for result, new_jobs in search.fetch_unique(queries, json.loads(industries), city, headers, max_results, url=url, max_age=MAX_PAGE_AGE):
+        if result.error:
+            errors += 1
+        for job in new_jobs:
+            fetched[str(search.job_key(job))] = job
+
+    now = time.time()
+    current = {key for key, in conn.execute(
+        "SELECT job_key FROM search_jobs WHERE search_id = ? AND removed_at IS NULL", (search_id,))}
+    added = [key for key in fetched if key not in current]
+    # A failed query says nothing about its postings, so nothing is marked removed on a partial run. A run
+    # that hit max_results is partial too: which postings fit depends on which queries answered first.
+    partial = errors or len(fetched) >= max_results
+    removed = [] if partial else [key for key in current if key not in fetched]
+    with conn:
+        conn.executemany(UPSERT_JOB, [(search_id, key, json.dumps(fetched[key]), now) for key in added])
+        conn.executemany("UPDATE search_jobs SET removed_at = ? WHERE search_id = ? AND job_key = ?",
+                         [(now, search_id, key) for key in removed])
+        conn.execute("INSERT INTO snapshots (search_id, run_at, total, added, removed, errors) VALUES (?, ?, ?, ?, ?, ?)",
+                     (search_id, now, len(current) + len(added) - len(removed), len(added), len(removed), errors))
+        conn.execute("UPDATE saved_searches SET last_run = ? WHERE id = ?", (now, search_id))
+    return len(added), len(removed)
+
+
+def refresh_due(conn, headers, url=search.JSEARCH_URL, now=None):
+    now = time.time() if now is None else now
+    due = conn.execute("""SELECT id FROM saved_searches
+                          WHERE last_run IS NULL OR last_run + interval_hours * 3600 <= ?""", (now,)).fetchall()
+    for search_id, in due:
+        try:
+            refresh(conn, search_id, headers, url)
+        except Exception as e:
+            print(f"Saved search {search_id} refresh failed: {e}")
+    return len(due)
+
+
+class Refresher(threading.Thread):
+    # Daemon thread that refreshes due saved searches every `poll` seconds
+    def __init__(self, headers, url=search.JSEARCH_URL, path=DB_PATH, poll=POLL_SECONDS):
+        super().__init__(name="saved-search-refresher", daemon=True)
+        self.headers = headers
+        self.url = url
+        self.path = path
+        self.poll = poll
+        self.stopped = threading.Event()
+
+    def run(self):
+        conn = connect(self.path)
+        while not self.stopped.is_set():
+            refresh_due(conn, self.headers, self.url)
+            self.stopped.wait(self.poll)
+
+    def stop(self):
+        self.stopped.set()
+
+
+_refreshers = {}
+_refreshers_lock = threading.Lock()
+
+
+def start_refresher(headers, url=search.JSEARCH_URL, path=DB_PATH, poll=POLL_SECONDS):
+    # One refresher per database per process, however many sessions call this
+    with _refreshers_lock:
+        refresher = _refreshers.get(path)
+        if refresher is None or not refresher.is_alive():
+            refresher = _refreshers[path] = Refresher(headers, url, path, poll)
+            refresher.start()
+        return refresher
+
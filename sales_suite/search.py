@@ -0,0 +1,194 @@
+import time
+import threading
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import urlparse
+
+from . import http_client, metrics
+from .response_cache import ResponseCache, make_key
+
+JSEARCH_URL = "https://jsearch.p.rapidapi.com/search"
+RAPIDAPI_HOST = "jsearch.p.rapidapi.com"
+MAX_WORKERS = 8
+REQUESTS_PER_SECOND = 10
+PAGE_SIZE = 10  # JSearch returns at most 10 postings per page
+MAX_PAGES = 5
+
+QueryResult = namedtuple("QueryResult", ["query", "data", "latency", "error", "cache", "page"], defaults=[None, 1])
+
+# Shared across sessions and processes; identical searches within the TTL never reach RapidAPI
+cache = ResponseCache("jsearch", ttl=6 * 3600, stale_ttl=24 * 3600)
+
+
+class RateLimiter:
+    # Spaces out request starts per host so a wide fan-out doesn't trip the provider's rate limit
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate else 0
+        self.lock = threading.Lock()
+        self.next_slot = {}
+
+    def wait(self, host):
+        if not self.interval:
+            return
+        with self.lock:
+            now = time.monotonic()
+            slot = max(now, self.next_slot.get(host, now))
+            self.next_slot[host] = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+# Shared by every session in the process, so concurrent users also respect the limit
+limiter = RateLimiter(REQUESTS_PER_SECOND)
+
+
+def rapidapi_headers(api_key):
+    return {"X-RapidAPI-Key": api_key, "X-RapidAPI-Host": RAPIDAPI_HOST}
+
+
+# Served instead of live results when the UI's "mock data" box is ticked
+MOCK_PAGE = {
+    "data": [
+        {
+            "job_title": "Senior Product Manager",
+            "employer_name": "ExampleCorp",
+            "job_city": "New York",
+            "job_state": "NY",
+            "job_description": "Lead cross-functional teams...",
+            "job_apply_link": "https://example.com/apply1"
+        },
+        {
+            "job_title": "Technical Account Manager",
+            "employer_name": "MockTech Inc.",
+            "job_city": "San Francisco",
+            "job_state": "CA",
+            "job_description": "Manage client relationships...",
+            "job_apply_link": "https://example.com/apply2"
+        }
+    ]
+}
+
+
+def split_terms(text):
+    # "Acme, Globex" -> ["Acme", "Globex"]
+    return [t.strip() for t in text.split(",") if t.strip()]
+
+
+def build_queries(companies, titles):
+    # One query per title x company pair; either list may be empty
+    return [" ".join(filter(None, [t, c])) for c in companies or [""] for t in titles or [""]]
+
+
+def job_row(job):
+    # A posting as a results table row
+    return {
+        "Company": job.get("employer_name", ""),
+        "Job Title": job.get("job_title", ""),
+        "Location": f"{job.get('job_city', '')}, {job.get('job_state', '')}".strip(", "),
+        "Link to Apply": job.get("job_apply_link", ""),
+        "Description": job.get("job_description", "")
+    }
+
+
+def build_params(query, industries, city, page="1"):
+    params = {
+        "query": query,
+        "page": page,
+        "industry": industries[0] if industries else None,
+        "location": city if city else None
+    }
+    return {k: v for k, v in params.items() if v}
+
+
+def _get_json(url, headers, params):
+    limiter.wait(urlparse(url).netloc)
+    response = http_client.get(url, headers=headers, params=params)
+    response.raise_for_status()
+    return response.json()
+
+
+def fetch_query(query, params, headers, url=JSEARCH_URL, max_age=None):
+    start = time.perf_counter()
+    try:
+        data, status = cache.get_or_fetch(
+            make_key(url, params),
+            lambda: _get_json(url, headers, params),
+            max_age
+        )
+    except Exception as e:
+        metrics.observe("jsearch_query_seconds", time.perf_counter() - start, cache="error")
+        return QueryResult(query, {}, time.perf_counter() - start, e, None, int(params.get("page", 1)))
+    metrics.observe("jsearch_query_seconds", time.perf_counter() - start, cache=status)
+    return QueryResult(query, data, time.perf_counter() - start, None, status, int(params.get("page", 1)))
+
+
+def job_key(job):
+    return job.get("job_id") or job.get("job_apply_link") or (job.get("employer_name"), job.get("job_title"), job.get("job_city"))
+
+
+class Deduper:
+    # Keeps postings unique across every page of every query, up to a global budget
+    def __init__(self, budget):
+        self.budget = budget
+        self.seen = set()
+
+    @property
+    def full(self):
+        return len(self.seen) >= self.budget
+
+    def take(self, jobs):
+        new_jobs = []
+        for job in jobs:
+            if self.full:
+                break
+            key = job_key(job)
+            if key not in self.seen:
+                self.seen.add(key)
+                new_jobs.append(job)
+        return new_jobs
+
+
+def dedupe(results, budget):
+    # Yields (result, new_jobs) for already-fetched results, stopping once the budget is met
+    deduper = Deduper(budget)
+    for result in results:
+        yield result, deduper.take(result.data.get("data", []))
+        if deduper.full:
+            return
+
+
+def mock_results(queries, budget):
+    # Same (result, new_jobs) stream as fetch_unique, without any API calls
+    return dedupe([QueryResult(query, MOCK_PAGE, 0.0, None, "mock") for query in queries], budget)
+
+
+def fetch_unique(queries, industries, city, headers, budget, url=JSEARCH_URL, max_pages=MAX_PAGES, max_workers=MAX_WORKERS, max_age=None):
+    # Fetches one page round across all queries at a time, in completion order, yielding (result, new_jobs).
+    # The next page is only requested for queries whose last page was full and still turned up new
+    # postings, and nothing more is requested once `budget` unique postings have been found.
+    # max_age (s) bounds how old a cached page may be; by default the cache's own TTLs apply.
+    if not queries:
+        return
+    deduper = Deduper(budget)
+    pending = list(queries)
+    page = 1
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(queries))) as pool:
+        while pending and page <= max_pages and not deduper.full:
+            futures = [
+                pool.submit(fetch_query, query, build_params(query, industries, city, str(page)), headers, url, max_age)
+                for query in pending
+            ]
+            more = []
+            for future in as_completed(futures):
+                result = future.result()
+                jobs = result.data.get("data", [])
+                new_jobs = deduper.take(jobs)
+                yield result, new_jobs
+                if len(jobs) >= PAGE_SIZE and new_jobs:
+                    more.append(result.query)
+                if deduper.full:
+                    for f in futures:
+                        f.cancel()
+                    return
+            pending = more
+            page += 1
@@ -0,0 +1,80 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Rough token estimate; good enough to keep every prompt well inside the model's context window
+CHARS_PER_TOKEN = 4
+CHUNK_TOKENS = 3000
+OVERLAP_TOKENS = 200
+MAX_WORKERS = 4
+
+CHUNK_PROMPT = "Summarize this section of a larger document, keeping names, figures and dates:"
+TASKS = {
+    "summary": "Summarize this:",
+    "account_plan": "Create an account plan based on this:",
+}
+
+
+def estimate_tokens(text):
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+def split_chunks(text, chunk_tokens=CHUNK_TOKENS, overlap_tokens=OVERLAP_TOKENS):
+    size = chunk_tokens * CHARS_PER_TOKEN
+    overlap = overlap_tokens * CHARS_PER_TOKEN
+    chunks = []
+    start = 0
+    while start < len(text):
+        end = min(start + size, len(text))
+        if end < len(text):
+            # Prefer to cut on a line break, then on a space, in the back half of the window
+            cut = text.rfind("\n", start + size // 2, end)
+            if cut < 0:
+                cut = text.rfind(" ", start + size // 2, end)
+            if cut > 0:
+                end = cut
+        chunks.append(text[start:end])
+        if end >= len(text):
+            break
+        space = text.find(" ", end - overlap, end)
+        start = max(space + 1 if space >= 0 else end - overlap, start + 1)
+    return chunks
+
+
+def _timed(complete, prompt):
+    start = time.perf_counter()
+    result = complete(prompt)
+    return result, time.perf_counter() - start
+
+
+def _map(chunks, complete, max_workers, stats, stage):
+    prompts = [f"{CHUNK_PROMPT}\n{chunk}" for chunk in chunks]
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(prompts))) as pool:
+        results = list(pool.map(lambda prompt: _timed(complete, prompt), prompts))
+    for i, (chunk, (_, latency)) in enumerate(zip(chunks, results), 1):
+        stats.append({"Stage": stage, "Chunk": i, "Tokens": estimate_tokens(chunk), "Latency (s)": round(latency, 3)})
+    return [summary for summary, _ in results]
+
+
+def condense(text, complete, chunk_tokens=CHUNK_TOKENS, overlap_tokens=OVERLAP_TOKENS, max_workers=MAX_WORKERS):
+    # Map stages only: summarize token-budgeted chunks concurrently until the text fits in one prompt.
+    # complete(prompt) -> str is the model call. Returns (text, per-chunk stats).
+    stats = []
+    stage = 1
+    while estimate_tokens(text) > chunk_tokens:
+        partials = _map(split_chunks(text, chunk_tokens, overlap_tokens), complete, max_workers, stats, f"map {stage}")
+        combined = "\n\n".join(partials)
+        if len(combined) >= len(text):
+            # The partial summaries stopped shrinking; reduce the shorter text rather than loop forever
+            break
+        text = combined
+        stage += 1
+    return text, stats
+
+
+def summarize(text, task, complete, **kwargs):
+    # Map-reduce: condense the text, then run `task` (e.g. "Summarize this:") over the partial summaries.
+    # Returns (result, per-chunk stats).
+    text, stats = condense(text, complete, **kwargs)
+    result, latency = _timed(complete, f"{task}\n{text}")
+    stats.append({"Stage": "reduce" if stats else "single", "Chunk": 1, "Tokens": estimate_tokens(text), "Latency (s)": round(latency, 3)})
+    return result, stats
@@ -0,0 +1 @@
+# Streamlit views over the sales_suite services
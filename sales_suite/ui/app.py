@@ -0,0 +1,265 @@
+import datetime
+
+import streamlit as st
+
+TASK_LABELS = {"Generate Summary": "summary", "Generate Account Plan": "account_plan"}
+
+
+def secret(name, default=""):
+    try:
+        return st.secrets.get(name, default)
+    except FileNotFoundError:
+        # No secrets.toml at all
+        return default
+
+
+def login():
+    # Returns True once signed in; otherwise draws the form
+    if st.session_state.get("logged_in"):
+        return True
+    st.title("🔐 Sign Up / Login")
+    with st.form("login_form"):
+        email = st.text_input("Email")
+        password = st.text_input("Password", type="password")
+        submit = st.form_submit_button("Sign In / Sign Up")
+        if submit:
+            if email and password:
+                st.session_state.logged_in = True
+                st.session_state.user_email = email
+            else:
+                st.warning("Please enter both email and password.")
+    return False
+
+
+def is_admin():
+    # Admins are listed in secrets.toml, e.g. admin_emails = ["ops@example.com"]
+    admins = {email.strip().lower() for email in secret("admin_emails", [])}
+    return st.session_state.get("user_email", "").strip().lower() in admins
+
+
+@st.cache_resource
+def saved_search_db(rapidapi_key):
+    # One connection and one background refresher per server process, not per rerun
+    from sales_suite import saved_searches, search
+    saved_searches.start_refresher(search.rapidapi_headers(rapidapi_key))
+    return saved_searches.connect()
+
+
+def search_tab():
+    import pandas as pd
+    from sales_suite import news, results_store, saved_searches, search
+    from sales_suite.ui import results_view
+
+    rapidapi_key = secret("rapidapi_key", "YOUR_RAPIDAPI_KEY")
+    saved_conn = saved_search_db(rapidapi_key)
+
+    with st.container():
+        col1, col2 = st.columns([2, 1])
+        with col1:
+            with st.form("job_search_form"):
+                company = st.text_input("Company Name")
+                generate_news = st.checkbox("Generate news stories")
+                title = st.text_input("Job Title")
+                industry = st.text_input("Industry")
+                city = st.text_input("City")
+                max_results = st.slider("Max number of job results", 1, 200, 50)
+                use_mock_data = st.checkbox("Use mock data (no API calls)")
+                save_search = st.checkbox("Save this search and refresh it in the background")
+                submit = st.form_submit_button("Search")
+
+                if submit and not (company or title or industry):
+                    st.warning("Please enter at least one search input.")
+
+    if submit and (company or title or industry):
+        companies = search.split_terms(company)
+        titles = search.split_terms(title)
+        industries = search.split_terms(industry)
+        queries = search.build_queries(companies, titles)
+
+        # Saved searches are refreshed from the live API, so mock results or a missing key can't be saved
+        if save_search and use_mock_data:
+            st.warning("Search not saved: saved searches refresh from the live job API. Untick mock data to save it.")
+        elif save_search and rapidapi_key in ("", "YOUR_RAPIDAPI_KEY"):
+            st.warning("Search not saved: set rapidapi_key in .streamlit/secrets.toml so it can be refreshed.")
+        elif save_search:
+            name = " · ".join(filter(None, [title, company, industry, city]))
+            saved_searches.save_search(saved_conn, name, companies, titles, industries, city, max_results)
+            st.success(f"Saved '{name}'; it refreshes every {saved_searches.REFRESH_HOURS} hours.")
+
+        if generate_news and companies:
+            with st.expander("📰 View News Articles", expanded=True):
+                for comp, entries in news.fetch_news(companies).items():
+                    st.markdown(f"#### 🔍 Top News About {comp}")
+                    if isinstance(entries, Exception):
+                        st.error(f"News error for '{comp}': {entries}")
+                        continue
+                    for entry in entries:
+                        st.markdown(f"- [{entry['title']}]({entry['link']})")
+
+        store = results_store.ResultsStore()
+        latencies = []
+        live_table = st.empty()
+        if use_mock_data:
+            results = search.mock_results(queries, max_results)
+        else:
+            results = search.fetch_unique(queries, industries, city, search.rapidapi_headers(rapidapi_key), max_results)
+
+        for result, new_jobs in results:
+            latencies.append({
+                "Query": result.query or "(any)",
+                "Page": result.page,
+                "Results": len(result.data.get("data", [])),
+                "New": len(new_jobs),
+                "Latency (s)": round(result.latency, 3),
+                "Cache": result.cache or "error"
+            })
+            if result.error:
+                st.error(f"API error for query '{result.query}': {result.error}")
+                continue
+
+            store.extend([search.job_row(job) for job in new_jobs])
+            if len(store):
+                live_table.dataframe(store.df.tail(results_view.PAGE_SIZES[0]).drop(columns=results_view.HIDDEN_COLUMNS),
+                                     column_config=results_view.LINK_CONFIG, hide_index=True)
+
+        live_table.empty()
+        if latencies:
+            with st.expander("⏱️ Query Latency"):
+                st.dataframe(pd.DataFrame(latencies), hide_index=True)
+                stats = search.cache.stats()
+                st.caption(f"Search cache: {stats['hits']} hits · {stats['stale']} stale · {stats['misses']} misses · {stats['entries']} entries")
+
+        # Kept in session state so filter changes and other reruns don't refetch or lose the results
+        st.session_state.job_results = store
+        if not len(store):
+            st.warning("No job results found.")
+
+    saved_store = results_view.render_saved_searches(saved_conn)
+    if saved_store is not None:
+        st.session_state.job_results = saved_store
+
+    store = st.session_state.get("job_results")
+    if store is not None and len(store):
+        results_section(store)
+
+
+def results_section(store):
+    from sales_suite import export
+    from sales_suite.ui import results_view
+
+    st.sidebar.header("🔎 Filter Results")
+    selected_company = st.sidebar.multiselect("Company", store.values("Company"), default=store.values("Company"))
+    selected_location = st.sidebar.multiselect("Location", store.values("Location"), default=store.values("Location"))
+    selections = {"Company": selected_company, "Location": selected_location}
+
+    st.markdown("### 📋 Job Results")
+    profile = st.session_state.get("profile")
+    if profile:
+        ranked_by, clear = st.columns([4, 1])
+        ranked_by.caption(f"Relevance is scored against {profile['name']} (set in File Upload & Summary).")
+        if clear.button("Clear profile"):
+            del st.session_state.profile
+            st.rerun()
+    order = results_view.render_results(store, selections, profile and profile["text"])
+    st.success(f"Showing {len(order)} of {len(store)} job postings.")
+
+    export_format = st.selectbox("Export format", export.available_formats(), format_func=export.LABELS.get)
+
+    # Only runs when the button is clicked, on a worker thread without the script context, so
+    # session state is read here. The file is written in chunks to a temp file, then handed over as bytes.
+    user_email = st.session_state.user_email
+
+    def build_export():
+        print(f"Download by {user_email} at {datetime.datetime.now()} ({len(order)} rows)")
+        with export.export_file(store.df, order, export_format) as exported:
+            return exported.read()
+
+    st.download_button(f"📥 Download {export.LABELS[export_format]}", build_export,
+                       file_name=f"job_results.{export_format}", mime=export.MIME_TYPES[export_format])
+
+
+def insights_tab():
+    st.markdown("### 🧠 Company Insights (Coming Soon)")
+    st.info("This section will include funding, hiring, tech stack insights via Crunchbase or Clearbit.")
+
+
+def upload_tab():
+    st.markdown("### 📎 Upload Files for Summary or Account Plan")
+    uploaded_file = st.file_uploader("Upload .txt, .pdf, or .docx", type=["txt", "pdf", "docx"])
+
+    # Either provider works; with both keys configured the user picks one
+    keys = {provider: secret(f"{provider}_api_key") for provider in ("openrouter", "openai")}
+    configured = [provider for provider, key in keys.items() if key]
+    if not uploaded_file:
+        return
+
+    import pandas as pd
+    from sales_suite import completion, extraction, summarizer
+
+    # Ranking is local TF-IDF over the postings' titles and descriptions, so it needs no LLM key
+    if st.button("Rank job results against this file"):
+        st.session_state.profile = {"name": uploaded_file.name, "text": extraction.cached_extract_text(uploaded_file)}
+        st.rerun()
+    if not configured:
+        st.error("No LLM key found. Add 'openrouter_api_key' or 'openai_api_key' to Streamlit Secrets.")
+        return
+
+    provider = configured[0]
+    if len(configured) > 1:
+        provider = st.radio("Model provider", configured, format_func=lambda p: completion.PROVIDERS[p].label, horizontal=True)
+    choice = st.radio("What do you want to generate?", list(TASK_LABELS))
+    if not st.button("Submit"):
+        return
+
+    with st.spinner("Extracting text..."):
+        extract_progress = st.progress(0.0)
+        content = extraction.cached_extract_text(uploaded_file, progress=lambda done, total: extract_progress.progress(done / total, text=f"Extracting text... {done / total:.0%}"))
+        extract_progress.empty()
+    with st.spinner(f"Generating via {completion.PROVIDERS[provider].label}..."):
+        try:
+            condensed, chunk_stats = summarizer.condense(content, completion.completer(provider, keys[provider]))
+            st.markdown("#### 🧾 Result:")
+            stream_stats = {}
+            prompt = f"{summarizer.TASKS[TASK_LABELS[choice]]}\n{condensed}"
+            st.write_stream(completion.stream(provider, keys[provider], prompt, stats=stream_stats))
+            st.caption(completion.describe_stream(stream_stats))
+            if chunk_stats:
+                with st.expander("⏱️ Chunk Latency"):
+                    st.dataframe(pd.DataFrame(chunk_stats), hide_index=True)
+        except Exception as e:
+            st.error(f"Error: {e}")
+    st.caption(f"Document cache: {extraction.cache.summary()}")
+    st.caption(f"Completion cache: {completion.cache.summary()}")
+
+
+def metrics_tab():
+    from sales_suite import completion, extraction, news, search
+    from sales_suite.ui import metrics_view
+    metrics_view.render_metrics([search.cache, news.cache, extraction.cache, completion.cache], controls=True)
+
+
+def main():
+    # The whole Sales Enablement Suite page. Streamlit re-executes the calling script on every
+    # interaction, so entry points call this each run; services are imported once signed in.
+    st.set_page_config(
+        page_title="Sales Enablement Suite",
+        page_icon="💼",
+        layout="wide",
+        initial_sidebar_state="expanded",
+    )
+    if not login():
+        return
+
+    st.title("💼 Sales Enablement Suite")
+    # The metrics tab can pause or reset recording for every session, so only admins get it
+    tabs = ["Job Search + News", "Company Insights", "File Upload & Summary"] + (["Admin: Metrics"] if is_admin() else [])
+    tab1, tab2, tab3, *admin_tab = st.tabs(tabs)
+    with tab1:
+        search_tab()
+    with tab2:
+        insights_tab()
+    with tab3:
+        upload_tab()
+    for tab in admin_tab:
+        with tab:
+            metrics_tab()
@@ -0,0 +1,48 @@
+import pandas as pd
+import streamlit as st
+
+from .. import metrics
+
+
+def render_metrics(caches=(), controls=False):
+    # View over this process' metrics; caches are ResponseCache instances to summarize. Recording
+    # and resetting affect every session, so they are only offered with controls (admins).
+    st.markdown("### 📈 Metrics")
+    if controls:
+        on = st.toggle("Record metrics", value=metrics.enabled)
+        if on != metrics.enabled:
+            metrics.enable(on)
+    else:
+        st.caption(f"Recording is {'on' if metrics.enabled else 'off'}.")
+
+    data = metrics.snapshot()
+    if data["histograms"]:
+        st.markdown("#### Latency")
+        st.dataframe(pd.DataFrame([{
+            "Metric": hist["name"],
+            "Labels": ", ".join(f"{k}={v}" for k, v in hist["labels"].items()),
+            "Count": hist["count"],
+            "Mean (ms)": round(1000 * hist["sum"] / hist["count"], 1),
+            "p50 ≤ (s)": hist["p50"],
+            "p95 ≤ (s)": hist["p95"],
+            "p99 ≤ (s)": hist["p99"]
+        } for hist in data["histograms"]]), hide_index=True)
+    if data["counters"]:
+        st.markdown("#### Counters")
+        st.dataframe(pd.DataFrame([{
+            "Metric": counter["name"],
+            "Labels": ", ".join(f"{k}={v}" for k, v in counter["labels"].items()),
+            "Value": counter["value"]
+        } for counter in data["counters"]]), hide_index=True)
+    if not data["histograms"] and not data["counters"]:
+        st.info("Nothing recorded yet.")
+
+    for cache in caches:
+        st.caption(f"{cache.name} cache: {cache.summary()}")
+
+    prom, as_json, clear = st.columns(3)
+    prom.download_button("Prometheus text", metrics.to_prometheus, file_name="metrics.prom", mime="text/plain")
+    as_json.download_button("JSON", metrics.to_json, file_name="metrics.json", mime="application/json")
+    if controls and clear.button("Reset metrics"):
+        metrics.reset()
+        st.rerun()
@@ -0,0 +1,71 @@
+import datetime
+
+import pandas as pd
+import streamlit as st
+
+from .. import metrics, results_store, saved_searches, search
+
+PAGE_SIZES = [25, 50, 100, 250]
+LINK_CONFIG = {
+    "Link to Apply": st.column_config.LinkColumn("Link to Apply", display_text="link"),
+    "Relevance": st.column_config.ProgressColumn("Relevance", min_value=0, max_value=1, format="%.2f"),
+}
+# Kept in the store (for ranking and exports) but too long to show by default
+HIDDEN_COLUMNS = ["Description"]
+
+
+def render_results(store, selections, profile=None):
+    # Paged, sortable view over a ResultsStore; only the visible page is sent to the browser.
+    # With a profile text, postings can be ranked by relevance to it (most relevant first).
+    # Returns the filtered, sorted row positions.
+    controls = st.columns(4)
+    sort_options = ["(none)"] + (["Relevance"] if profile else []) + list(store.df.columns)
+    sort_by = controls[0].selectbox("Sort by", sort_options, index=1 if profile else 0)
+    descending = controls[1].selectbox("Order", ["Ascending", "Descending"], disabled=sort_by == "Relevance") == "Descending"
+    page_size = controls[2].selectbox("Rows per page", PAGE_SIZES, index=1)
+    if sort_by == "Relevance":
+        order = store.rank(selections, profile)
+    else:
+        order = store.order(selections, None if sort_by == "(none)" else sort_by, descending)
+    pages = max(1, -(-len(order) // page_size))
+    page = controls[3].number_input("Page", min_value=1, max_value=pages, value=1)
+    shown = [col for col in store.df.columns if col not in HIDDEN_COLUMNS]
+    columns = st.multiselect("Columns", list(store.df.columns), default=shown)
+
+    with metrics.span("render_seconds", view="results"):
+        start = (page - 1) * page_size
+        window = store.window(order, start, page_size, columns)
+        if profile:
+            window.insert(0, "Relevance", store.scores(profile)[order[start:start + page_size]])
+        st.dataframe(window, column_config=LINK_CONFIG, hide_index=True)
+    st.caption(f"Page {page} of {pages} · {len(order)} postings")
+    return order
+
+
+def render_saved_searches(conn):
+    # Reads what the background refresher stored; nothing here calls the API.
+    # Returns a ResultsStore when the user opens a saved search's postings, else None.
+    searches = saved_searches.list_searches(conn)
+    if not searches:
+        return None
+    with st.expander("🗂️ Saved Searches"):
+        st.dataframe(pd.DataFrame([{
+            "Search": s["name"],
+            "Last refreshed": datetime.datetime.fromtimestamp(s["last_run"]).strftime("%Y-%m-%d %H:%M") if s["last_run"] else "pending",
+            "Postings": s["total"] or 0,
+            "New": s["added"] or 0,
+            "Removed": s["removed"] or 0
+        } for s in searches]), hide_index=True)
+        chosen = st.selectbox("Saved search", searches, format_func=lambda s: s["name"])
+        removed = saved_searches.removed_jobs(conn, chosen["id"])
+        if removed:
+            st.caption("No longer listed: " + "; ".join(f"{job.get('job_title', '')} at {job.get('employer_name', '')}" for job in removed))
+        show, delete = st.columns(2)
+        if delete.button("Delete saved search"):
+            saved_searches.delete_search(conn, chosen["id"])
+            st.rerun()
+        if show.button("Show postings"):
+            store = results_store.ResultsStore()
+            store.extend([search.job_row(job) for job, _ in saved_searches.current_jobs(conn, chosen["id"])])
+            return store
+    return None
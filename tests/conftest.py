@@ -0,0 +1,51 @@
+import json
+
+import pytest
+
+from benchmarks import stubs
+from sales_suite import completion, extraction, news, search
+from sales_suite.response_cache import ResponseCache
+
+
+class JobsHandler(stubs._Handler):
+    # A JSearch stand-in whose postings and status each test sets; every request is counted
+    jobs = []
+    status = 200
+    requests = 0
+
+    def do_GET(self):
+        type(self).requests += 1
+        if self.status != 200:
+            self.send_body(b"{}", "application/json", self.status)
+            return
+        self.send_body(json.dumps({"data": self.jobs}).encode(), "application/json")
+
+
+@pytest.fixture(autouse=True)
+def caches(tmp_path, monkeypatch):
+    # Every test starts with empty response caches of its own and no request spacing
+    for module in (search, news, extraction, completion):
+        monkeypatch.setattr(module, "cache", ResponseCache(module.cache.name, path=str(tmp_path / "cache.db")))
+    monkeypatch.setattr(search, "limiter", search.RateLimiter(0))
+
+
+@pytest.fixture
+def serve():
+    # serve(handler) starts a stub on a free port for the test and returns its base URL
+    servers = []
+
+    def start(handler):
+        url, server = stubs.serve(handler)
+        servers.append(server)
+        return url
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.fixture
+def jobs_api(serve):
+    # (handler class, search URL); the class is the test's own, so setting jobs or status is isolated
+    handler = type("Jobs", (JobsHandler,), {"jobs": [], "status": 200, "requests": 0})
+    return handler, serve(handler) + "/search"
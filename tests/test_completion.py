@@ -0,0 +1,60 @@
+import json
+
+from benchmarks import stubs
+from sales_suite import completion
+
+
+def event(delta):
+    # Raw UTF-8 rather than \u escapes, as OpenAI and OpenRouter send it
+    return "data: " + json.dumps({"choices": [{"delta": delta}]}, ensure_ascii=False) + "\n\n"
+
+
+class Events(stubs._Handler):
+    # Replays a fixed SSE body, including the keep-alives and comments providers send
+    body = "".join([
+        ": OPENROUTER PROCESSING\n\n",
+        event({"role": "assistant"}),
+        event({"content": "Hel"}),
+        "\n",
+        'data: {"choices": []}\n\n',
+        'data:{"choices": [{"delta": {"content": "lo"}}]}\n\n',
+        "data: [DONE]\n\n",
+        event({"content": "after done"}),
+    ])
+    requests = 0
+
+    def do_POST(self):
+        type(self).requests += 1
+        self.rfile.read(int(self.headers["Content-Length"]))
+        self.send_body(self.body.encode(), "text/event-stream")
+
+
+def test_stream_skips_comments_and_stops_at_done(serve):
+    url = serve(Events)
+    stats = {}
+    assert list(completion.stream_completion(url, {}, "mock", "hi", stats=stats)) == ["Hel", "lo"]
+    assert (stats["tokens"], stats["cached"]) == (2, False)
+
+
+def test_stream_is_served_from_cache_the_second_time(serve):
+    handler = type("Events", (Events,), {"requests": 0})
+    url = serve(handler)
+    list(completion.stream_completion(url, {}, "mock", "hi"))
+    stats = {}
+    assert list(completion.stream_completion(url, {}, "mock", "hi", stats=stats)) == ["Hello"]
+    assert stats["cached"] and handler.requests == 1
+
+
+def test_stream_decodes_utf8_without_a_charset(serve):
+    # Content-Type is a bare text/event-stream, as most providers send it
+    handler = type("Events", (Events,), {"body": event({"content": "Café — "}) + event({"content": "naïve 👍"}) + "data: [DONE]\n\n"})
+    url = serve(handler)
+    assert list(completion.stream_completion(url, {}, "mock", "hi")) == ["Café — ", "naïve 👍"]
+    # The cached copy is the decoded text too
+    assert list(completion.stream_completion(url, {}, "mock", "hi")) == ["Café — naïve 👍"]
+
+
+def test_stream_reads_chunked_deltas_as_they_arrive(serve):
+    url = serve(stubs.CompletionHandler) + "/v1/chat/completions"
+    prompt = "one two three four"
+    assert list(completion.stream_completion(url, {}, "mock", prompt)) == [word + " " for word in prompt.split()]
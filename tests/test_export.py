@@ -0,0 +1,46 @@
+import io
+
+import pandas as pd
+import pytest
+
+from sales_suite import export
+from sales_suite.results_store import ResultsStore
+
+
+@pytest.fixture
+def store(monkeypatch):
+    # Small chunks, so every writer crosses chunk boundaries
+    monkeypatch.setattr(export, "CHUNK_ROWS", 2)
+    results = ResultsStore()
+    results.extend([{"Company": f"Company {i}", "Job Title": f"Rôle {i}", "Location": "Zürich" if i % 2 else "NYC",
+                     "Link to Apply": f"https://example.com/{i}", "Description": ""} for i in range(5)])
+    return results
+
+
+def read(fmt, store, order):
+    with export.export_file(store.df, order, fmt) as exported:
+        data = io.BytesIO(exported.read())
+    if fmt == "csv":
+        return pd.read_csv(data, keep_default_na=False)
+    if fmt == "xlsx":
+        return pd.read_excel(data).fillna("")
+    return pd.read_parquet(data)
+
+
+@pytest.mark.parametrize("fmt", ["csv", "xlsx", "parquet"])
+def test_writers_keep_rows_in_the_given_order(fmt, store):
+    if fmt not in export.available_formats():
+        pytest.skip(f"{fmt} support is not installed")
+    order = [4, 0, 3, 1, 2]
+    df = read(fmt, store, order)
+    assert list(df.columns) == list(store.df.columns)
+    assert df["Job Title"].tolist() == [f"Rôle {i}" for i in order]
+    assert df["Location"].astype(str).tolist() == ["NYC", "NYC", "Zürich", "Zürich", "NYC"]
+
+
+@pytest.mark.parametrize("fmt", ["csv", "xlsx", "parquet"])
+def test_writers_handle_an_empty_selection(fmt, store):
+    if fmt not in export.available_formats():
+        pytest.skip(f"{fmt} support is not installed")
+    df = read(fmt, store, [])
+    assert len(df) == 0 and list(df.columns) == list(store.df.columns)
@@ -0,0 +1,50 @@
+import pytest
+
+import gig_db
+
+
+@pytest.fixture
+def conn(tmp_path):
+    return gig_db.connection(str(tmp_path / "gigs.db"))
+
+
+def rollup(conn):
+    return conn.execute("SELECT gig_id, status, count FROM gig_status_counts ORDER BY gig_id, status").fetchall()
+
+
+def recount(conn):
+    return conn.execute("""SELECT gig_id, status, COUNT(*) FROM gig_singer_status
+                           GROUP BY gig_id, status ORDER BY gig_id, status""").fetchall()
+
+
+def test_rollup_follows_inserts_updates_and_deletes(conn):
+    gig_db.add_gig(conn, "Acme", "Gala", "2030-01-01", "Hall")
+    gig_db.add_gig(conn, "Acme", "Brunch", "2030-01-02", "Cafe")
+    for i in range(4):
+        gig_db.add_singer(conn, f"Singer{i}", "Test", f"s{i}@example.com")
+
+    assert gig_db.save_statuses(conn, 1, {1: "Available", 2: "Available", 3: "Inquired"}, {}) == 3
+    assert rollup(conn) == recount(conn) == [(1, "Available", 2), (1, "Inquired", 1)]
+
+    gig_db.save_statuses(conn, 1, {1: "Booked", 2: "Available", 3: "Possible"}, {1: "Available", 2: "Available", 3: "Inquired"})
+    board = gig_db.load_board(conn, 1)
+    assert gig_db.move_singers(conn, 1, {2: "Booked"}, {2: board[2][2]})
+    with conn:
+        conn.execute("UPDATE gig_singer_status SET gig_id = 2 WHERE singer_id = 3")
+        conn.execute("INSERT INTO gig_singer_status (gig_id, singer_id, status) VALUES (2, 4, 'Possible')")
+        conn.execute("DELETE FROM gig_singer_status WHERE singer_id = 1")
+    # Emptied groups are dropped rather than left at zero
+    assert rollup(conn) == recount(conn) == [(1, "Booked", 1), (2, "Possible", 2)]
+
+
+def test_double_booking_is_rejected_not_raised(conn):
+    gig_db.add_gig(conn, "Acme", "Gala", "2030-01-01", "Hall")
+    gig_db.add_gig(conn, "Other", "Party", "2030-01-01", "Loft")
+    gig_db.add_singer(conn, "Ada", "Test", "ada@example.com")
+    gig_db.save_statuses(conn, 1, {1: "Booked"}, {})
+    gig_db.save_statuses(conn, 2, {1: "Available"}, {})
+
+    assert gig_db.booked_elsewhere(conn, 2, [1]) == {1: "Gala"}
+    assert gig_db.save_statuses(conn, 2, {1: "Booked"}, {1: "Available"}) is None
+    assert not gig_db.move_singers(conn, 2, {1: "Booked"}, {1: gig_db.load_board(conn, 2)[1][2]})
+    assert gig_db.load_statuses(conn, 2) == {1: "Available"}
@@ -0,0 +1,84 @@
+import csv
+import datetime
+import io
+
+import pytest
+from openpyxl import Workbook
+
+import gig_db
+import gig_import
+from sales_suite.extraction import NamedBytes
+
+
+@pytest.fixture
+def conn(tmp_path):
+    return gig_db.connection(str(tmp_path / "gigs.db"))
+
+
+def roster(*lines, encoding="utf-8"):
+    return NamedBytes("\n".join(lines).encode(encoding), "roster.csv")
+
+
+def test_singers_are_validated_and_deduplicated(conn):
+    gig_db.add_singer(conn, "Ada", "Lovelace", "ada@example.com")
+    result = gig_import.import_singers(conn, roster(
+        "First,Surname,E-mail",
+        "Grace,Hopper,grace@example.com",
+        "Ada,L,ADA@example.com",  # already in the database
+        ",Nobody,x@example.com",
+        "",
+        "Alan,Turing,not-an-email",
+        "Grace,H,Grace@Example.com",  # earlier in the file
+    ))
+    assert (result.rows, result.inserted, result.duplicates, result.error) == (6, 1, 2, None)
+    assert result.rejects == [(4, "missing first or last name"), (6, "invalid email 'not-an-email'")]
+    assert conn.execute("SELECT COUNT(*) FROM singers").fetchone()[0] == 2
+
+
+def test_windows_1252_csv_is_decoded(conn):
+    result = gig_import.import_singers(conn, roster("first_name,last_name,email", "José,Núñez,jose@example.com", encoding="cp1252"))
+    assert result.inserted == 1
+    assert conn.execute("SELECT first_name, last_name FROM singers").fetchone() == ("José", "Núñez")
+
+
+def test_utf8_bom_is_not_part_of_the_first_header(conn):
+    result = gig_import.import_singers(conn, roster("\ufefffirst_name,last_name,email", "Ada,Lovelace,ada@example.com"))
+    assert (result.inserted, result.rejects) == (1, [])
+
+
+def test_gigs_from_xlsx_with_date_and_number_cells(conn):
+    wb = Workbook()
+    wb.active.append(["Client", "Gig", "Date", "Venue", "Needed"])
+    wb.active.append(["Acme", "Gala", datetime.datetime(2030, 5, 1), "Hall", 3.0])
+    wb.active.append(["Acme", "Brunch", "05/02/2030", "Cafe", None])
+    wb.active.append(["Acme", "Picnic", "someday", "Park", 1])
+    wb.active.append(["Acme", "Gala", "2030-05-01", "hall", 2])  # same gig, other spelling
+    out = io.BytesIO()
+    wb.save(out)
+    result = gig_import.import_gigs(conn, NamedBytes(out.getvalue(), "gigs.xlsx"))
+    assert (result.inserted, result.duplicates, result.rejects) == (2, 1, [(4, "invalid date 'someday'")])
+    assert conn.execute("SELECT gig_name, date, singers_needed FROM gigs ORDER BY id").fetchall() == [
+        ("Gala", "2030-05-01", 3), ("Brunch", "2030-05-02", 1)]
+
+
+def test_unreadable_xlsx_is_reported(conn):
+    result = gig_import.import_singers(conn, NamedBytes(b"not a workbook", "roster.xlsx"))
+    assert (result.rows, result.inserted) == (0, 0)
+    assert result.error
+
+
+def test_rows_before_a_parser_error_are_kept(conn, monkeypatch):
+    monkeypatch.setattr(gig_import, "CHUNK_ROWS", 2)
+    limit = csv.field_size_limit(50)
+    try:
+        result = gig_import.import_singers(conn, roster(
+            "first_name,last_name,email",
+            *(f"Singer{i},Test,s{i}@example.com" for i in range(3)),
+            "Long," + "x" * 100 + ",long@example.com",
+            "After,Test,after@example.com",
+        ))
+    finally:
+        csv.field_size_limit(limit)
+    assert (result.rows, result.inserted) == (3, 3)
+    assert result.error.endswith("(after row 4)")
+    assert conn.execute("SELECT COUNT(*) FROM singers").fetchone()[0] == 3
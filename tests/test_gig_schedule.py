@@ -0,0 +1,60 @@
+import itertools
+import random
+from collections import Counter
+
+import gig_db
+import gig_schedule
+
+
+def best_size(capacity, edges):
+    # Brute-force maximum matching size for small instances
+    options = {}
+    for singer, gig, _ in edges:
+        options.setdefault(singer, [None]).append(gig)
+    best = 0
+    for choice in itertools.product(*options.values()):
+        seats = Counter(gig for gig in choice if gig is not None)
+        if all(seats[gig] <= capacity[gig] for gig in seats):
+            best = max(best, sum(seats.values()))
+    return best
+
+
+def test_match_is_maximum_and_respects_capacity():
+    rng = random.Random(0)
+    for _ in range(300):
+        capacity = {gig: rng.randint(0, 2) for gig in range(rng.randint(1, 4))}
+        edges = [(singer, gig, rng.randint(0, 1)) for singer in range(rng.randint(1, 6)) for gig in capacity if rng.random() < 0.5]
+        assigned = gig_schedule._match(capacity, edges)
+        assert set(assigned.items()) <= {(singer, gig) for singer, gig, _ in edges}
+        assert all(count <= capacity[gig] for gig, count in Counter(assigned.values()).items())
+        assert len(assigned) == best_size(capacity, edges)
+
+
+def test_match_prefers_better_options():
+    assigned = gig_schedule._match({"a": 1, "b": 1}, [(1, "a", 1), (1, "b", 0)])
+    assert assigned == {1: "b"}
+
+
+def test_match_handles_long_reseat_chains():
+    # Singer i sits greedily on gig i; seating the last singer re-seats every one of them
+    n = 3000
+    capacity = {gig: 1 for gig in range(n + 1)}
+    edges = [(i, i, 0) for i in range(n)] + [(i, i + 1, 1) for i in range(n)] + [(n, 0, 0)]
+    assert len(gig_schedule._match(capacity, edges)) == n + 1
+
+
+def test_propose_never_double_books(tmp_path):
+    conn = gig_db.connection(str(tmp_path / "gigs.db"))
+    gig_db.add_gig(conn, "Acme", "Gala", "2030-01-01", "Hall", singers_needed=2)
+    gig_db.add_gig(conn, "Other", "Party", "2030-01-01", "Loft")
+    for i in range(2):
+        gig_db.add_singer(conn, f"Singer{i}", "Test", f"s{i}@example.com")
+    gig_db.save_statuses(conn, 1, {1: "Available", 2: "Possible"}, {})
+    gig_db.save_statuses(conn, 2, {1: "Available"}, {})
+
+    plan = gig_schedule.propose(conn, "2030-01-01")
+    assert len(plan.bookings) == 2
+    assert len({booking.singer_id for booking in plan.bookings}) == 2
+    assert sum(plan.open_slots.values()) == 1
+    assert gig_schedule.apply_plan(conn, plan)
+    assert gig_schedule.double_bookings(conn) == []
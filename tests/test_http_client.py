@@ -0,0 +1,137 @@
+import time
+from urllib.parse import urlparse
+
+import pytest
+import requests
+
+from benchmarks import stubs
+from sales_suite import http_client
+
+
+class Flaky(stubs._Handler):
+    # Answers `failures` requests with `status`, then succeeds
+    failures = 0
+    status = 503
+    requests = 0
+
+    def do_GET(self):
+        type(self).requests += 1
+        if self.requests <= self.failures:
+            self.send_body(b"busy", "text/plain", self.status, headers=[("Retry-After", "0")])
+        else:
+            self.send_body(b"ok", "text/plain")
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(http_client, "backoff", lambda attempt: 0)
+
+
+def flaky(serve, failures, status=503):
+    handler = type("Flaky", (Flaky,), {"failures": failures, "status": status, "requests": 0})
+    return handler, serve(handler)
+
+
+def test_retries_until_success(serve):
+    handler, url = flaky(serve, 2)
+    assert http_client.get(url).text == "ok"
+    assert handler.requests == 3
+
+
+def test_returns_last_response_when_retries_run_out(serve):
+    handler, url = flaky(serve, 10)
+    assert http_client.get(url, retries=1).status_code == 503
+    assert handler.requests == 2
+
+
+def test_circuit_opens_after_consecutive_failures(serve):
+    handler, url = flaky(serve, 100)
+    http_client.get(url, retries=http_client.FAILURE_THRESHOLD - 1)
+    with pytest.raises(http_client.CircuitOpen):
+        http_client.get(url)
+    assert handler.requests == http_client.FAILURE_THRESHOLD
+
+
+def test_rate_limits_do_not_open_the_circuit(serve):
+    handler, url = flaky(serve, http_client.FAILURE_THRESHOLD + 1, status=429)
+    http_client.get(url, retries=http_client.FAILURE_THRESHOLD - 1)
+    assert http_client.get(url).text == "ok"
+
+
+def test_breaker_allows_one_trial_after_reset():
+    breaker = http_client.CircuitBreaker(threshold=2, reset=30)
+    breaker.record(False)
+    breaker.check("host")  # still below the threshold
+    breaker.record(False)
+    with pytest.raises(http_client.CircuitOpen):
+        breaker.check("host")
+    breaker.opened_at -= 30
+    breaker.check("host")
+    with pytest.raises(http_client.CircuitOpen):
+        breaker.check("host")  # a trial is already in flight
+    breaker.record(True)
+    breaker.check("host")
+    assert breaker.failures == 0
+
+
+def test_retry_after_accepts_seconds_and_dates():
+    response = requests.Response()
+    response.headers["Retry-After"] = "7"
+    assert http_client.retry_after(response) == 7
+    response.headers["Retry-After"] = "Wed, 21 Oct 2015 07:28:00 GMT"
+    assert http_client.retry_after(response) == 0
+    response.headers["Retry-After"] = "soon"
+    assert http_client.retry_after(response) is None
+
+
+class Truncated(stubs._Handler):
+    # Promises a chunked body and hangs up halfway through the first chunk
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        self.wfile.write(b"100\r\npartial")
+        self.wfile.flush()
+        self.close_connection = True
+
+
+def test_failed_trial_reopens_the_circuit_for_another_reset(serve):
+    url = serve(Truncated)
+    _, breaker = http_client._host_state(urlparse(url).netloc)
+    breaker.failures = breaker.threshold
+    breaker.opened_at = time.monotonic() - breaker.reset
+    with pytest.raises(requests.RequestException):
+        http_client.get(url)
+    with pytest.raises(http_client.CircuitOpen):
+        http_client.get(url)
+    # Once the reset period passes again, another trial is let through
+    breaker.opened_at -= breaker.reset
+    breaker.check("host")
+
+
+class Slow(stubs._Handler):
+    # Takes longer to answer than the tests' read timeout
+    requests = 0
+
+    def respond(self):
+        type(self).requests += 1
+        time.sleep(0.3)
+        self.send_body(b"late", "text/plain")
+
+    do_GET = do_POST = respond
+
+
+def test_read_timeouts_are_not_retried_for_posts(serve):
+    handler = type("Slow", (Slow,), {"requests": 0})
+    url = serve(handler)
+    with pytest.raises(requests.ReadTimeout):
+        http_client.post(url, timeout=(1, 0.1), retries=2)
+    assert handler.requests == 1
+
+
+def test_read_timeouts_are_retried_for_gets(serve):
+    handler = type("Slow", (Slow,), {"requests": 0})
+    url = serve(handler)
+    with pytest.raises(requests.ReadTimeout):
+        http_client.get(url, timeout=(1, 0.1), retries=2)
+    assert handler.requests == 3
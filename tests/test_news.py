@@ -0,0 +1,52 @@
+import pytest
+
+from benchmarks import stubs
+from sales_suite import news
+
+
+@pytest.fixture
+def feed(serve):
+    # (handler class, feed URL); the handler records the If-None-Match header of every request
+    handler = type("Feed", (stubs.RSSHandler,), {"seen": []})
+    original = handler.do_GET
+
+    def do_GET(self):
+        handler.seen.append(self.headers.get("If-None-Match"))
+        original(self)
+    handler.do_GET = do_GET
+    return handler, serve(handler) + "/rss"
+
+
+def test_fresh_feed_is_served_from_cache(feed):
+    handler, url = feed
+    first = news.fetch_feed(url, 3)
+    assert len(first) == 3
+    assert news.fetch_feed(url, 3) == first
+    assert handler.seen == [None]
+
+
+def test_expired_feed_is_revalidated_with_its_etag(feed, monkeypatch):
+    handler, url = feed
+    first = news.fetch_feed(url, 3)
+    monkeypatch.setattr(news.cache, "ttl", -1)
+    assert news.fetch_feed(url, 2) == first[:2]
+    assert handler.seen == [None, '"fixture"']
+    assert news.cache.stats()["not_modified"] == 1
+
+
+def test_longer_limit_refetches_the_whole_feed(feed):
+    handler, url = feed
+    news.fetch_feed(url, 2)
+    assert len(news.fetch_feed(url, 5)) == 5
+    assert handler.seen == [None, None]
+
+
+def test_fetch_news_keeps_order_and_maps_failures(jobs_api, serve, monkeypatch):
+    rss_url = serve(stubs.RSSHandler)
+    handler, missing_url = jobs_api
+    handler.status = 404
+    monkeypatch.setattr(news, "feed_url", lambda company: missing_url if company == "Gone" else f"{rss_url}/rss?q={company}")
+    results = news.fetch_news(["Acme", "Gone", "Globex"], 2)
+    assert list(results) == ["Acme", "Gone", "Globex"]
+    assert isinstance(results["Gone"], Exception)
+    assert len(results["Acme"]) == len(results["Globex"]) == 2
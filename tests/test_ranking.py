@@ -0,0 +1,46 @@
+import numpy as np
+
+from sales_suite.ranking import RelevanceIndex, terms
+
+
+def test_closer_documents_score_higher():
+    index = RelevanceIndex()
+    index.add(["Account executive for enterprise software", "Warehouse forklift operator", "Account manager, software renewals"])
+    scores = index.scores("Enterprise account executive selling software")
+    assert list(np.argsort(-scores)) == [0, 2, 1]
+    assert scores[1] == 0 and 0 < scores[0] <= 1
+
+
+def test_incremental_add_matches_a_single_build():
+    texts = ["sales engineer cloud", "account executive cloud", "support engineer", "sales manager"]
+    whole, grown = RelevanceIndex(), RelevanceIndex()
+    whole.add(texts)
+    grown.add(texts[:1])
+    grown.scores("cloud sales")
+    grown.add(texts[1:])
+    assert np.allclose(whole.scores("cloud sales"), grown.scores("cloud sales"))
+
+
+def test_documents_without_terms_score_zero():
+    index = RelevanceIndex()
+    assert len(index.scores("anything")) == 0
+    index.add(["", "—"])
+    assert index.scores("sales").tolist() == [0, 0]
+
+
+def test_profile_without_known_terms_scores_zero():
+    index = RelevanceIndex()
+    index.add(["sales engineer"])
+    assert index.scores("zzz").tolist() == [0]
+
+
+def test_terms_keep_unicode_words_whole():
+    assert terms("Ingénieur commercial — Zürich")[:3] == ["ingénieur", "commercial", "zürich"]
+    assert terms("C++ and C# engineers")[:4] == ["c++", "and", "c#", "engineers"]
+
+
+def test_non_latin_postings_are_ranked():
+    index = RelevanceIndex()
+    index.add(["営業 エンジニア 東京", "経理 担当 大阪"])
+    scores = index.scores("東京 の 営業")
+    assert scores[0] > 0 and scores[1] == 0
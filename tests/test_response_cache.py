@@ -0,0 +1,82 @@
+import time
+import types
+
+import pytest
+
+from sales_suite import response_cache
+from sales_suite.response_cache import ResponseCache, make_key
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    # The cache's notion of now, moved forward by the test
+    clock = types.SimpleNamespace(now=1000.0)
+    monkeypatch.setattr(response_cache, "time", types.SimpleNamespace(time=lambda: clock.now))
+    return clock
+
+
+@pytest.fixture
+def cache(tmp_path, clock):
+    return ResponseCache("test", path=str(tmp_path / "cache.db"), ttl=60, stale_ttl=600)
+
+
+def wait_for_refresh(cache):
+    deadline = time.monotonic() + 5
+    while cache.refreshing and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert not cache.refreshing
+
+
+def test_make_key_normalizes_equivalent_queries():
+    assert make_key("jsearch", {"query": " Sales Engineer ", "page": "1", "location": None}) == \
+        make_key("jsearch", {"query": "sales engineer", "page": "1", "location": ""})
+    assert make_key("jsearch", {"query": "sales"}) != make_key("news", {"query": "sales"})
+
+
+def test_fresh_entries_are_hits(cache, clock):
+    assert cache.get_or_fetch("k", lambda: "v1") == ("v1", "miss")
+    clock.now += 59
+    assert cache.get_or_fetch("k", lambda: "v2") == ("v1", "hit")
+    assert (cache.stats()["hits"], cache.stats()["misses"]) == (1, 1)
+
+
+def test_stale_entries_are_served_while_refreshing(cache, clock):
+    cache.get_or_fetch("k", lambda: "v1")
+    clock.now += 120
+    assert cache.get_or_fetch("k", lambda: "v2") == ("v1", "stale")
+    wait_for_refresh(cache)
+    assert cache.get_or_fetch("k", lambda: "v3") == ("v2", "hit")
+
+
+def test_failed_refresh_keeps_the_stale_value(cache, clock):
+    cache.get_or_fetch("k", lambda: "v1")
+    clock.now += 120
+
+    def fail():
+        raise RuntimeError("provider down")
+    assert cache.get_or_fetch("k", fail) == ("v1", "stale")
+    wait_for_refresh(cache)
+    assert cache.get_or_fetch("k", fail) == ("v1", "stale")
+
+
+def test_expired_entries_are_refetched(cache, clock):
+    cache.get_or_fetch("k", lambda: "v1")
+    clock.now += 60 + 600 + 1
+    assert cache.get_or_fetch("k", lambda: "v2") == ("v2", "miss")
+
+
+def test_max_age_bypasses_stale_entries(cache, clock):
+    cache.get_or_fetch("k", lambda: "v1")
+    clock.now += 30
+    assert cache.get_or_fetch("k", lambda: "v2", max_age=10) == ("v2", "miss")
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path, clock):
+    cache = ResponseCache("small", path=str(tmp_path / "cache.db"), max_bytes=30)
+    for key in "abc":
+        cache.store(key, "x" * 8)  # 10 bytes as JSON
+        clock.now += 1
+    cache.lookup("a")
+    clock.now += 1
+    cache.store("d", "x" * 8)
+    assert [cache.lookup(key)[0] is not None for key in "abcd"] == [True, False, True, True]
@@ -0,0 +1,41 @@
+from sales_suite.results_store import ResultsStore
+
+
+def row(company, title, location):
+    return {"Company": company, "Job Title": title, "Location": location, "Link to Apply": "", "Description": ""}
+
+
+def store():
+    results = ResultsStore()
+    results.extend([row("Acme", "PM", "NYC"), row("Globex", "AE", "SF")])
+    # A second batch adds a new category to each filter column
+    results.extend([row("Acme", "SE", "SF"), row("Initech", "CSM", "Austin")])
+    return results
+
+
+def test_positions_intersect_filters_across_batches():
+    results = store()
+    assert sorted(results.values("Company")) == ["Acme", "Globex", "Initech"]
+    assert results.positions({"Company": ["Acme"], "Location": ["SF"]}).tolist() == [2]
+    assert results.positions({"Company": ["Acme", "Initech"]}).tolist() == [0, 2, 3]
+    assert results.positions({"Company": ["Nobody"]}).tolist() == []
+
+
+def test_positions_is_none_when_nothing_is_filtered():
+    results = store()
+    assert results.positions({"Company": results.values("Company"), "Location": results.values("Location")}) is None
+
+
+def test_order_sorts_the_filtered_rows():
+    results = store()
+    assert results.order({}, "Job Title").tolist() == [1, 3, 0, 2]
+    assert results.order({"Location": ["SF"]}, "Job Title", descending=True).tolist() == [2, 1]
+    assert results.order({"Company": ["Acme"]}).tolist() == [0, 2]
+
+
+def test_new_rows_invalidate_cached_sort_orders():
+    results = store()
+    results.order({}, "Job Title")
+    results.extend([row("Umbrella", "AAA", "NYC")])
+    assert results.order({}, "Job Title").tolist()[0] == 4
+    assert results.window(results.order({"Location": ["NYC"]}), 0, 1, ["Company"])["Company"].tolist() == ["Acme"]
@@ -0,0 +1,75 @@
+import json
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from benchmarks import stubs
+from sales_suite import saved_searches
+
+
+class PerQuery(stubs._Handler):
+    # Three postings of its own for every query
+    def do_GET(self):
+        query = parse_qs(urlparse(self.path).query)["query"][0]
+        self.send_body(json.dumps({"data": [{"job_id": f"{query}-{i}"} for i in range(3)]}).encode(), "application/json")
+
+
+def job(n):
+    return {"job_id": f"job-{n}", "job_title": f"Job {n}"}
+
+
+@pytest.fixture
+def saved(tmp_path, monkeypatch):
+    # (conn, search id) for one saved search; pages are always refetched so each refresh sees the stub's current jobs
+    monkeypatch.setattr(saved_searches, "MAX_PAGE_AGE", -1)
+    conn = saved_searches.connect(str(tmp_path / "saved.db"))
+    saved_searches.save_search(conn, "Acme AEs", ["Acme"], ["Account Executive"], [], "", 50)
+    yield conn, saved_searches.list_searches(conn)[0]["id"]
+    conn.close()
+
+
+def test_refresh_diffs_against_the_previous_snapshot(saved, jobs_api):
+    (conn, search_id), (handler, url) = saved, jobs_api
+    handler.jobs = [job(1), job(2), job(3)]
+    assert saved_searches.refresh(conn, search_id, {}, url) == (3, 0)
+    handler.jobs = [job(2), job(3), job(4)]
+    assert saved_searches.refresh(conn, search_id, {}, url) == (1, 1)
+
+    current = {posting["job_id"]: is_new for posting, is_new in saved_searches.current_jobs(conn, search_id)}
+    assert current == {"job-2": False, "job-3": False, "job-4": True}
+    assert saved_searches.removed_jobs(conn, search_id) == [job(1)]
+    latest = saved_searches.list_searches(conn)[0]
+    assert (latest["total"], latest["added"], latest["removed"], latest["errors"]) == (3, 1, 1, 0)
+
+
+def test_failed_refresh_removes_nothing(saved, jobs_api):
+    (conn, search_id), (handler, url) = saved, jobs_api
+    handler.jobs = [job(1), job(2)]
+    saved_searches.refresh(conn, search_id, {}, url)
+    handler.status = 404
+    assert saved_searches.refresh(conn, search_id, {}, url) == (0, 0)
+    assert len(saved_searches.current_jobs(conn, search_id)) == 2
+    assert saved_searches.list_searches(conn)[0]["errors"] == 1
+
+
+def test_reappearing_posting_counts_as_new(saved, jobs_api):
+    (conn, search_id), (handler, url) = saved, jobs_api
+    for jobs in ([job(1)], [job(2)], [job(1), job(2)]):
+        handler.jobs = jobs
+        added, _ = saved_searches.refresh(conn, search_id, {}, url)
+    assert added == 1
+
+
+def test_refresh_capped_by_max_results_removes_nothing(tmp_path, serve, monkeypatch):
+    # Two queries of three postings each under a budget of three: each refresh keeps whichever
+    # postings arrived first, which says nothing about what was removed upstream
+    monkeypatch.setattr(saved_searches, "MAX_PAGE_AGE", -1)
+    url = serve(PerQuery) + "/search"
+    conn = saved_searches.connect(str(tmp_path / "saved.db"))
+    saved_searches.save_search(conn, "Two titles", ["Acme"], ["AE", "SE"], [], "", 3)
+    search_id = saved_searches.list_searches(conn)[0]["id"]
+    for _ in range(4):
+        _, removed = saved_searches.refresh(conn, search_id, {}, url)
+        assert removed == 0
+    assert 3 <= len(saved_searches.current_jobs(conn, search_id)) <= 6
+    conn.close()
@@ -0,0 +1,42 @@
+from benchmarks import stubs
+from sales_suite import search
+
+
+def test_mock_results_dedupes_across_queries():
+    # Every query gets the same mock page, so only the first one turns up new postings
+    results = list(search.mock_results(["a", "b", "c"], 50))
+    assert [len(new_jobs) for _, new_jobs in results] == [2, 0, 0]
+
+
+def test_mock_results_stops_at_budget():
+    results = list(search.mock_results(["a", "b"], 1))
+    assert [len(new_jobs) for _, new_jobs in results] == [1]
+
+
+def test_fetch_unique_pages_until_a_short_page(serve):
+    # The replay stub serves three full pages per query, then a short one
+    url = serve(stubs.JSearchHandler) + "/search"
+    found = [job for _, new_jobs in search.fetch_unique(["a", "b"], [], "", {}, 1000, url=url) for job in new_jobs]
+    assert len(found) == len({job["job_id"] for job in found}) == 2 * (3 * search.PAGE_SIZE + 3)
+
+
+def test_fetch_unique_stops_at_budget(serve):
+    url = serve(stubs.JSearchHandler) + "/search"
+    results = list(search.fetch_unique(["a", "b", "c"], [], "", {}, 25, url=url))
+    assert sum(len(new_jobs) for _, new_jobs in results) == 25
+
+
+def test_fetch_unique_stops_paging_once_nothing_is_new(jobs_api):
+    handler, url = jobs_api
+    handler.jobs = [{"job_id": str(i)} for i in range(search.PAGE_SIZE)]
+    results = list(search.fetch_unique(["a", "b"], [], "", {}, 100, url=url))
+    assert sum(len(new_jobs) for _, new_jobs in results) == search.PAGE_SIZE
+    # Page 1 of both queries, then page 2 only for the query whose page 1 was new
+    assert handler.requests == 3
+
+
+def test_fetch_unique_reports_errors_per_query(jobs_api):
+    handler, url = jobs_api
+    handler.status = 404
+    results = list(search.fetch_unique(["a"], [], "", {}, 10, url=url))
+    assert [(result.error is not None, new_jobs) for result, new_jobs in results] == [(True, [])]